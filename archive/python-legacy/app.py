@@ -21,9 +21,10 @@ def main(argv: list[str] | None = None) -> int:
     parser.add_argument("--share", action="store_true", help="Create a public Gradio link")
     args = parser.parse_args(argv)
 
-    from toolkit.ui import build_ui
+    from toolkit.ui import build_ui, start_model_cache_warmup
 
     app = build_ui()
+    start_model_cache_warmup()
     app.launch(server_name=args.host, server_port=args.port, share=args.share)
     return 0
 
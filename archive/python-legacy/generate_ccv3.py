@@ -85,6 +85,7 @@ def main() -> int:
     started = time.time()
     report = run_generation(config)
     elapsed = time.time() - started
+    report = {k: v for k, v in report.items() if k not in ("card_obj", "lorebook_obj")}
     print(json.dumps({"ok": True, "elapsed_sec": round(elapsed, 2), **report}, ensure_ascii=False, indent=2))
     return 0
 
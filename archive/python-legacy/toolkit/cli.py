@@ -26,6 +26,9 @@ import time
 from typing import List
 
 
+_MODELS_SPLIT_RE = re.compile(r"[,\n]+")
+
+
 def _cmd_import(args: argparse.Namespace) -> int:
     from .extract import resolve_conversations_path, extract_by_models, discover_models, parse_models_arg
     from .dataset import build_dataset
@@ -189,6 +192,7 @@ def _cmd_generate(args: argparse.Namespace) -> int:
     started = time.time()
     report = run_generation(config, log_fn=lambda m: print(f"  {m}"))
     elapsed = time.time() - started
+    report = {k: v for k, v in report.items() if k not in ("card_obj", "lorebook_obj")}
     print(json.dumps({"ok": True, "elapsed_sec": round(elapsed, 2), **report}, ensure_ascii=False, indent=2))
     return 0
 
@@ -206,7 +210,7 @@ def _cmd_fidelity(args: argparse.Namespace) -> int:
         print(f"Preset error: {err}")
         return 1
 
-    models = [m.strip() for m in re.split(r"[,\n]+", args.models or "") if m.strip()][:5]
+    models = [m.strip() for m in _MODELS_SPLIT_RE.split(args.models or "") if m.strip()][:5]
     prompts = [p.strip() for p in (args.test_prompts or "").split(";") if p.strip()]
     if not prompts:
         prompts = [
@@ -247,6 +251,7 @@ def _cmd_fidelity(args: argparse.Namespace) -> int:
         judge_site_url=judge_site_url,
         judge_app_name=judge_app_name,
         judge_model=args.judge_model or "",
+        response_cache_dir=args.response_cache_dir or "",
     )
 
     report = run_fidelity_evaluation(config)
@@ -325,8 +330,9 @@ def _cmd_ui(args: argparse.Namespace) -> int:
     load_dotenv_file()
     bootstrap_presets_from_env()
 
-    from .ui import build_ui
+    from .ui import build_ui, start_model_cache_warmup
     app = build_ui()
+    start_model_cache_warmup()
     host = args.host or "0.0.0.0"
     port = args.port or 7860
     share = args.share or False
@@ -392,6 +398,8 @@ def main(argv: List[str] | None = None) -> int:
     p_fid.add_argument("--timeout", type=int, default=180)
     p_fid.add_argument("--test-prompts", default="", help="Test prompts separated by semicolons")
     p_fid.add_argument("--judge-model", default="")
+    p_fid.add_argument("--response-cache-dir", default="",
+                       help="Reuse identical model replies from earlier runs stored here (24h)")
 
     # models
     p_models = subparsers.add_parser("models", help="List models from conversations.json")
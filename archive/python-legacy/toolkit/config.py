@@ -4,8 +4,10 @@ from __future__ import annotations
 
 import json
 import os
+import threading
 from typing import Any, Dict, List, Optional, Tuple
 
+from .jsonio import loads
 from .llm_client import LLMConfig, PROVIDER_CHOICES, default_base_url, fetch_models_with_metadata
 
 
@@ -165,8 +167,7 @@ def load_presets() -> Dict[str, Dict[str, str]]:
     if not os.path.isfile(path):
         return {}
     try:
-        with open(path, "r", encoding="utf-8") as f:
-            data = json.load(f)
+        data = _read_json_store(path)
         if not isinstance(data, dict):
             return {}
         out: Dict[str, Dict[str, str]] = {}
@@ -262,8 +263,34 @@ def preset_to_llm_config(preset_name: str, model: str = "", **overrides: Any) ->
     return cfg, ""
 
 
+# --- Config store reads ---
+
+# path -> ((mtime_ns, size), parsed JSON); only a handful of store files exist
+_STORE_MEMO: Dict[str, Tuple[Tuple[int, int], Any]] = {}
+
+
+def _read_json_store(path: str) -> Any:
+    """Parsed JSON of a config store file, re-read only when its stat changes.
+
+    The returned object is shared; loaders build fresh cleaned copies from it.
+    """
+    st = os.stat(path)
+    sig = (st.st_mtime_ns, st.st_size)
+    hit = _STORE_MEMO.get(path)
+    if hit is not None and hit[0] == sig:
+        return hit[1]
+    with open(path, "rb") as f:
+        data = loads(f.read())
+    _STORE_MEMO[path] = (sig, data)
+    return data
+
+
 # --- Model cache ---
 
+# Serializes the per-preset read-modify-writes below; the startup warm-up and
+# an explicit preset save can update the cache files concurrently.
+_model_cache_lock = threading.Lock()
+
 def _model_cache_store_path() -> str:
     return os.path.join("config", "llm_model_cache.json")
 
@@ -277,8 +304,7 @@ def load_model_cache() -> Dict[str, List[str]]:
     if not os.path.isfile(path):
         return {}
     try:
-        with open(path, "r", encoding="utf-8") as f:
-            data = json.load(f)
+        data = _read_json_store(path)
         out: Dict[str, List[str]] = {}
         if isinstance(data, dict):
             for key, value in data.items():
@@ -301,8 +327,7 @@ def load_model_meta_cache() -> Dict[str, Dict[str, int]]:
     if not os.path.isfile(path):
         return {}
     try:
-        with open(path, "r", encoding="utf-8") as f:
-            data = json.load(f)
+        data = _read_json_store(path)
         out: Dict[str, Dict[str, int]] = {}
         if isinstance(data, dict):
             for preset_name, meta in data.items():
@@ -335,16 +360,16 @@ def cache_models_for_preset(preset_name: str, models: List[str]) -> None:
     key = (preset_name or "").strip()
     if not key:
         return
-    cache = load_model_cache()
-    cache[key] = sorted(set(m for m in models if m.strip()))
-    save_model_cache(cache)
+    with _model_cache_lock:
+        cache = load_model_cache()
+        cache[key] = sorted(set(m for m in models if m.strip()))
+        save_model_cache(cache)
 
 
 def cache_model_meta_for_preset(preset_name: str, model_meta: Dict[str, int]) -> None:
     key = (preset_name or "").strip()
     if not key:
         return
-    cache = load_model_meta_cache()
     clean: Dict[str, int] = {}
     for model_name, raw_window in (model_meta or {}).items():
         name = str(model_name).strip()
@@ -356,8 +381,10 @@ def cache_model_meta_for_preset(preset_name: str, model_meta: Dict[str, int]) ->
             continue
         if window > 0:
             clean[name] = window
-    cache[key] = clean
-    save_model_meta_cache(cache)
+    with _model_cache_lock:
+        cache = load_model_meta_cache()
+        cache[key] = clean
+        save_model_meta_cache(cache)
 
 
 def get_cached_models(preset_name: str) -> List[str]:
@@ -520,7 +520,8 @@ def unzip_export(zip_path: str, output_dir: str) -> str:
 def resolve_conversations_path(input_path: str) -> Tuple[str, str]:
     """Given a path to a ZIP or conversations.json, return (conversations_json_path, log).
 
-    If it's a ZIP, auto-unzips to a sibling directory.
+    If it's a ZIP, extracts conversations.json (or the whole archive when it
+    isn't at the root) to a sibling directory.
     """
     input_path = (input_path or "").strip()
     if not input_path:
@@ -531,8 +532,17 @@ def resolve_conversations_path(input_path: str) -> Tuple[str, str]:
     if input_path.lower().endswith(".zip"):
         base = os.path.splitext(os.path.basename(input_path))[0]
         out_dir = os.path.join(os.path.dirname(input_path) or ".", f"imports/{base}")
-        msg = unzip_export(input_path, out_dir)
         convo_path = os.path.join(out_dir, "conversations.json")
+        # Exports bundle images/audio next to conversations.json; only the
+        # transcript is read, so pull just that member when it's at the root
+        try:
+            with zipfile.ZipFile(input_path, "r") as zf:
+                if "conversations.json" in zf.namelist():
+                    zf.extract("conversations.json", out_dir)
+                    return convo_path, f"Extracted conversations.json: {convo_path}"
+        except zipfile.BadZipFile as exc:
+            return "", f"Error: not a valid zip file: {exc}"
+        msg = unzip_export(input_path, out_dir)
         if os.path.isfile(convo_path):
             return convo_path, msg
         return "", msg
@@ -6,15 +6,33 @@ Uses toolkit.llm_client for all LLM calls.
 from __future__ import annotations
 
 import concurrent.futures
+import functools
+import hashlib
 import json
+import mmap
 import os
 import re
+import statistics
+import threading
+import time
+from collections import Counter
 from dataclasses import dataclass
 from datetime import datetime, timezone
-from typing import Any, Dict, List, Tuple
+from typing import Any, Callable, Dict, List, Optional, Tuple
 
+from .jsonio import dumps_compact, dumps_pretty, loads
 from .llm_client import LLMConfig, chat_complete
 
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+try:
+    import tiktoken
+except ImportError:
+    tiktoken = None
+
 
 STOPWORDS = {
     "the", "a", "an", "and", "or", "but", "to", "of", "in", "on", "for",
@@ -22,6 +40,8 @@ STOPWORDS = {
     "at", "from", "by", "i", "you", "we", "they", "me", "my", "your", "our",
 }
 
+FIRST_PERSON_WORDS = ("i", "me", "my", "mine", "myself")
+
 
 @dataclass
 class FidelityConfig:
@@ -43,6 +63,12 @@ class FidelityConfig:
     judge_site_url: str
     judge_app_name: str
     judge_model: str
+    enable_prompt_cache: bool = True  # reuse the shared system prefix across calls
+    max_parallel_requests: Optional[int] = None  # None = one slot per prompt + judge call
+    per_call_timeout_s: Optional[float] = None  # initial hedge deadline; adapts to P50 * 1.5
+    retry_on_timeout: int = 0  # opt-in: extra (paid) attempts fired when a call overruns its deadline
+    response_cache_dir: str = ""  # reuse identical replies from earlier runs ("" = off)
+    response_cache_ttl_s: float = 24 * 3600
 
     def candidate_llm_config(self, model: str) -> LLMConfig:
         return LLMConfig(
@@ -54,6 +80,7 @@ class FidelityConfig:
             app_name=self.app_name,
             temperature=self.temperature,
             timeout=self.timeout,
+            enable_prompt_cache=self.enable_prompt_cache,
         )
 
     def judge_llm_config(self) -> LLMConfig:
@@ -67,15 +94,133 @@ class FidelityConfig:
             temperature=0.0,
             timeout=self.timeout,
             max_tokens=1200,
+            enable_prompt_cache=self.enable_prompt_cache,
         )
 
 
+class _HedgedCaller:
+    """Run LLM calls with a per-call deadline and duplicate ("hedged") retries.
+
+    When an attempt overruns its deadline a duplicate is fired, up to
+    `retries` times; the first attempt to succeed wins. Overrun attempts are
+    not abandoned, since an in-flight HTTP request cannot be cancelled anyway.
+    Deadlines start at `initial_timeout` (None = none) and switch to the
+    observed median latency * 1.5 once `min_samples` calls have finished.
+    Latencies are tracked per key so slow models are not held to the pace
+    of fast ones. Every duplicate is a billed provider call, so callers
+    enable hedging explicitly; with `retries=0` (and no pool) each call runs
+    once, directly on the caller's thread.
+    """
+
+    _RECHECK_S = 1.0
+
+    def __init__(self, pool: Optional[concurrent.futures.ThreadPoolExecutor], initial_timeout: Optional[float],
+                 retries: int, min_samples: int = 3) -> None:
+        self._pool = pool
+        self._initial_timeout = initial_timeout
+        self._retries = max(0, retries)
+        self._min_samples = min_samples
+        self._lock = threading.Lock()
+        self._latencies: Dict[str, List[float]] = {}
+
+    def _deadline(self, key: str) -> Optional[float]:
+        with self._lock:
+            samples = self._latencies.get(key) or []
+            if len(samples) >= self._min_samples:
+                return statistics.median(samples) * 1.5
+        return self._initial_timeout
+
+    def _record(self, key: str, seconds: float) -> None:
+        with self._lock:
+            self._latencies.setdefault(key, []).append(seconds)
+
+    def call(self, key: str, fn: Callable[[], str]) -> str:
+        if self._pool is None or not self._retries:
+            return fn()
+        started: Dict[concurrent.futures.Future, float] = {}
+        fut = self._pool.submit(fn)
+        started[fut] = last_start = time.monotonic()
+        pending = {fut}
+        hedges_left = self._retries
+        error: Optional[BaseException] = None
+        while pending:
+            deadline = self._deadline(key) if hedges_left else None
+            if deadline is not None:
+                wait_s: Optional[float] = max(0.0, last_start + deadline - time.monotonic())
+            else:
+                # Without a deadline yet, wake periodically in case one appears
+                wait_s = self._RECHECK_S if hedges_left else None
+            done, pending = concurrent.futures.wait(
+                pending, timeout=wait_s, return_when=concurrent.futures.FIRST_COMPLETED,
+            )
+            for fut in done:
+                if fut.exception() is None:
+                    self._record(key, time.monotonic() - started[fut])
+                    return fut.result()
+                error = fut.exception()
+            if not pending:
+                break
+            if deadline is not None and time.monotonic() - last_start >= deadline:
+                fut = self._pool.submit(fn)
+                started[fut] = last_start = time.monotonic()
+                pending.add(fut)
+                hedges_left -= 1
+        raise error if error is not None else RuntimeError("LLM call produced no result")
+
+
+class _ResponseCache:
+    """Exact-match reply cache on disk, one JSON file per request.
+
+    Keyed on provider, endpoint, model, sampling settings and the full
+    message list, so any change to the card, prompt or temperature misses.
+    Entries older than `ttl_s` are ignored and overwritten.
+    """
+
+    def __init__(self, directory: str, ttl_s: float) -> None:
+        self._dir = directory
+        self._ttl_s = ttl_s
+        self._lock = threading.Lock()
+        self.hits = 0
+        os.makedirs(directory, exist_ok=True)
+
+    @staticmethod
+    def key(llm_config: LLMConfig, messages: List[Dict[str, str]]) -> str:
+        raw = dumps_compact([
+            llm_config.provider, llm_config.base_url, llm_config.model,
+            round(llm_config.temperature, 2), llm_config.max_tokens, messages,
+        ])
+        return hashlib.sha256(raw).hexdigest()
+
+    def get(self, key: str) -> Optional[str]:
+        path = os.path.join(self._dir, f"{key}.json")
+        try:
+            with open(path, "rb") as f:
+                entry = loads(f.read())
+        except (OSError, ValueError):
+            return None
+        if not isinstance(entry, dict) or time.time() - float(entry.get("created", 0)) > self._ttl_s:
+            return None
+        text = entry.get("response")
+        if not isinstance(text, str):
+            return None
+        with self._lock:
+            self.hits += 1
+        return text
+
+    def put(self, key: str, text: str) -> None:
+        path = os.path.join(self._dir, f"{key}.json")
+        tmp = f"{path}.{threading.get_ident()}.tmp"
+        with open(tmp, "wb") as f:
+            f.write(dumps_compact({"created": time.time(), "response": text}))
+        os.replace(tmp, path)
+
+
 def _safe_text(v: Any) -> str:
     return v if isinstance(v, str) else ""
 
 
-def _tokens(text: str) -> List[str]:
-    return re.findall(r"[a-zA-Z']+", text.lower())
+def _tokens(text: str, lowered: bool = False) -> List[str]:
+    return re.findall(r"[a-zA-Z']+", text if lowered else text.lower())
 
 
 def _sentence_count(text: str) -> int:
@@ -83,7 +228,12 @@ def _sentence_count(text: str) -> int:
     return len([p for p in parts if p.strip()]) or 1
 
 
-def style_profile(texts: List[str]) -> Dict[str, Any]:
+def style_profile(
+    texts: List[str],
+    pre_joined: Optional[str] = None,
+    pre_lowered: Optional[str] = None,
+) -> Dict[str, Any]:
+    """Style metrics for texts; pre_joined/pre_lowered reuse an existing newline join."""
     if not texts:
         return {
             "avg_words_per_message": 0.0, "avg_sentences_per_message": 0.0,
@@ -91,27 +241,28 @@ def style_profile(texts: List[str]) -> Dict[str, Any]:
             "empathy_marker_rate": 0.0, "lexical_diversity": 0.0, "top_words": [],
         }
 
-    joined = "\n".join(texts)
-    all_tokens = _tokens(joined)
+    joined = pre_joined if pre_joined is not None else "\n".join(texts)
+    low_joined = pre_lowered if pre_lowered is not None else joined.lower()
+    all_tokens = _tokens(low_joined, lowered=True)
     msg_count = max(1, len(texts))
     sentence_total = sum(_sentence_count(t) for t in texts)
     question_total = sum(t.count("?") for t in texts)
     exclaim_total = sum(t.count("!") for t in texts)
-    first_person_total = sum(1 for tok in all_tokens if tok in {"i", "me", "my", "mine", "myself"})
     empathy_markers = ["that makes sense", "i hear you", "i'm here", "we can", "you're not alone", "let's"]
     empathy_hits = 0
-    low_joined = joined.lower()
     for marker in empathy_markers:
         empathy_hits += low_joined.count(marker)
 
-    freqs: Dict[str, int] = {}
-    for tok in all_tokens:
-        if tok in STOPWORDS or len(tok) < 3:
-            continue
-        freqs[tok] = freqs.get(tok, 0) + 1
+    # One counting pass in C; every token metric below reads the vocabulary
+    token_counts = Counter(all_tokens)
+    first_person_total = sum(token_counts[w] for w in FIRST_PERSON_WORDS)
+    freqs = {
+        tok: count for tok, count in token_counts.items()
+        if len(tok) >= 3 and tok not in STOPWORDS
+    }
     top_words = sorted(freqs.items(), key=lambda kv: kv[1], reverse=True)[:50]
 
-    unique_tokens = len(set(all_tokens))
+    unique_tokens = len(token_counts)
     lexical_diversity = (unique_tokens / max(1, len(all_tokens))) if all_tokens else 0.0
 
     return {
@@ -126,8 +277,14 @@ def style_profile(texts: List[str]) -> Dict[str, Any]:
     }
 
 
+PROFILE_NUMERIC_KEYS = (
+    "avg_words_per_message", "avg_sentences_per_message", "question_rate",
+    "exclaim_rate", "first_person_rate", "empathy_marker_rate", "lexical_diversity",
+)
+
+
 def _component_similarity(base: float, cand: float) -> float:
-    if base == 0 and cand == 0:
+    if base == cand:
         return 100.0
     if base == 0:
         return max(0.0, 100.0 - (abs(cand) * 100.0))
@@ -136,12 +293,22 @@ def _component_similarity(base: float, cand: float) -> float:
 
 
 def compare_profiles(baseline: Dict[str, Any], candidate: Dict[str, Any]) -> Dict[str, float]:
-    numeric_keys = [
-        "avg_words_per_message", "avg_sentences_per_message", "question_rate",
-        "exclaim_rate", "first_person_rate", "empathy_marker_rate", "lexical_diversity",
-    ]
-    component_scores = [_component_similarity(float(baseline[k]), float(candidate[k])) for k in numeric_keys]
-    style_score = sum(component_scores) / len(component_scores)
+    base_vals = [float(baseline[k]) for k in PROFILE_NUMERIC_KEYS]
+    cand_vals = [float(candidate[k]) for k in PROFILE_NUMERIC_KEYS]
+    if np is not None:
+        # Vectorized _component_similarity: one ufunc chain over all components
+        base_arr = np.array(base_vals)
+        cand_arr = np.array(cand_vals)
+        denom = np.where(base_arr == 0, 1.0, np.abs(base_arr))
+        component_scores = np.where(
+            base_arr == cand_arr,
+            100.0,
+            np.maximum(0.0, 100.0 - (np.abs(cand_arr - base_arr) / denom) * 100.0),
+        )
+        style_score = float(component_scores.mean())
+    else:
+        component_scores = [_component_similarity(b, c) for b, c in zip(base_vals, cand_vals)]
+        style_score = sum(component_scores) / len(component_scores)
 
     base_set = set(baseline.get("top_words") or [])
     cand_set = set(candidate.get("top_words") or [])
@@ -155,13 +322,25 @@ def compare_profiles(baseline: Dict[str, Any], candidate: Dict[str, Any]) -> Dic
     }
 
 
+_ASSISTANT_PREFIX = b"[assistant] "
+
+
 def _load_assistant_transcript(transcript_path: str) -> List[str]:
+    # Find the prefix on raw bytes so only assistant lines pay for UTF-8 decode;
+    # the match itself runs on decoded text, as text-mode reading did.
+    # bytes.splitlines splits on \n, \r\n and \r, like universal newlines.
     lines: List[str] = []
-    with open(transcript_path, "r", encoding="utf-8") as f:
-        for raw in f:
-            line = raw.strip()
-            if line.startswith("[assistant] "):
-                lines.append(line[len("[assistant] "):].strip())
+    with open(transcript_path, "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return lines
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            for raw in iter(mm.readline, b""):
+                for piece in raw.splitlines():
+                    if _ASSISTANT_PREFIX not in piece:
+                        continue
+                    line = piece.decode("utf-8").strip()
+                    if line.startswith("[assistant] "):
+                        lines.append(line[len("[assistant] "):].strip())
     return lines
 
 
@@ -189,51 +368,84 @@ def _build_character_system_prompt(card: Dict[str, Any]) -> str:
     return "\n".join(p for p in parts if p.strip())
 
 
+# Judge context caps, in tokens (approximated as 4 chars/token without tiktoken)
+JUDGE_BASELINE_TOKENS = 2500
+JUDGE_PROFILE_TOKENS = 1000
+
+
+@functools.lru_cache(maxsize=1)
+def _token_encoding() -> Any:
+    if tiktoken is None:
+        return None
+    try:
+        return tiktoken.get_encoding("cl100k_base")
+    except Exception:
+        # Encoding files may be unavailable offline
+        return None
+
+
+def _truncate_tokens(text: str, max_tokens: int) -> str:
+    """Cut text to at most max_tokens tokens."""
+    enc = _token_encoding()
+    if enc is None:
+        return text[: max_tokens * 4]
+    tokens = enc.encode(text, disallowed_special=())
+    if len(tokens) <= max_tokens:
+        return text
+    return enc.decode(tokens[:max_tokens])
+
+
+_JUDGE_SYSTEM_PROMPT = (
+    "You are a strict personality fidelity judge. Your ONLY job is to score how well "
+    "a candidate AI's responses match the VOICE, TONE, and STYLE of a specific baseline personality.\n\n"
+    "You are NOT scoring response quality, helpfulness, accuracy, or coherence. "
+    "A candidate that gives a perfect, helpful answer in the WRONG voice scores LOW. "
+    "A candidate that sounds exactly like the baseline personality scores HIGH, even if less polished.\n\n"
+    "## Scoring rubric (0-100):\n"
+    "- **90-100**: Nearly indistinguishable from baseline. Same sentence structure, same emotional tone, "
+    "same level of formality, same use of punctuation/emphasis, same conversational habits.\n"
+    "- **70-89**: Clearly the same personality. Minor differences in verbosity or style but the "
+    "core voice is recognizable.\n"
+    "- **50-69**: Partial match. Some traits present but mixed with a clearly different default voice.\n"
+    "- **30-49**: Weak match. Occasional echoes of the personality but fundamentally different style.\n"
+    "- **0-29**: No resemblance. Generic AI assistant voice, or an entirely different personality.\n\n"
+    "## What to compare:\n"
+    "- Sentence length and structure (short/punchy vs long/flowing)\n"
+    "- Formality level (casual/conversational vs academic/professional)\n"
+    "- Use of questions, exclamations, hedging language\n"
+    "- Emotional warmth vs clinical detachment\n"
+    "- Use of metaphor, humor, directness\n"
+    "- First-person usage patterns\n"
+    "- How they open and close responses\n\n"
+    "Return JSON only: {\"score\": <number 0-100>, \"rationale\": \"<2-3 sentences>\"}"
+)
+
+
 def _judge_score(
     config: FidelityConfig,
     baseline_excerpt: str,
     character_description: str,
     prompts: List[str],
     responses: List[str],
+    complete: Callable[[LLMConfig, List[Dict[str, str]]], str] = chat_complete,
 ) -> Tuple[float, str]:
     if not config.judge_model:
         return 0.0, ""
 
-    judge_system = (
-        "You are a strict personality fidelity judge. Your ONLY job is to score how well "
-        "a candidate AI's responses match the VOICE, TONE, and STYLE of a specific baseline personality.\n\n"
-        "You are NOT scoring response quality, helpfulness, accuracy, or coherence. "
-        "A candidate that gives a perfect, helpful answer in the WRONG voice scores LOW. "
-        "A candidate that sounds exactly like the baseline personality scores HIGH, even if less polished.\n\n"
-        "## Scoring rubric (0-100):\n"
-        "- **90-100**: Nearly indistinguishable from baseline. Same sentence structure, same emotional tone, "
-        "same level of formality, same use of punctuation/emphasis, same conversational habits.\n"
-        "- **70-89**: Clearly the same personality. Minor differences in verbosity or style but the "
-        "core voice is recognizable.\n"
-        "- **50-69**: Partial match. Some traits present but mixed with a clearly different default voice.\n"
-        "- **30-49**: Weak match. Occasional echoes of the personality but fundamentally different style.\n"
-        "- **0-29**: No resemblance. Generic AI assistant voice, or an entirely different personality.\n\n"
-        "## What to compare:\n"
-        "- Sentence length and structure (short/punchy vs long/flowing)\n"
-        "- Formality level (casual/conversational vs academic/professional)\n"
-        "- Use of questions, exclamations, hedging language\n"
-        "- Emotional warmth vs clinical detachment\n"
-        "- Use of metaphor, humor, directness\n"
-        "- First-person usage patterns\n"
-        "- How they open and close responses\n\n"
-        "Return JSON only: {\"score\": <number 0-100>, \"rationale\": \"<2-3 sentences>\"}"
-    )
-
     # Build paired prompt/response display
     exchanges = []
     for i, (p, r) in enumerate(zip(prompts, responses)):
         exchanges.append(f"PROMPT {i+1}: {p}\nCANDIDATE RESPONSE {i+1}: {r}")
 
-    judge_user = (
+    # Baseline + profile are identical for every model, so they ride in the
+    # system prompt where provider prompt caching can reuse them.
+    judge_preamble = (
         "## Baseline personality (from real historical conversations):\n\n"
-        f"{baseline_excerpt[:10000]}\n\n"
+        f"{baseline_excerpt}\n\n"
         "## Character profile extracted from these conversations:\n\n"
-        f"{character_description[:4000]}\n\n"
+        f"{character_description}"
+    )
+    judge_user = (
         "## Candidate responses to evaluate:\n\n"
         + "\n\n---\n\n".join(exchanges)
         + "\n\nScore ONLY how well the candidate's VOICE matches the baseline. "
@@ -241,9 +453,12 @@ def _judge_score(
     )
 
     judge_config = config.judge_llm_config()
-    text = chat_complete(
+    text = complete(
         judge_config,
-        [{"role": "system", "content": judge_system}, {"role": "user", "content": judge_user}],
+        [
+            {"role": "system", "content": _JUDGE_SYSTEM_PROMPT + "\n\n" + judge_preamble},
+            {"role": "user", "content": judge_user},
+        ],
     )
     try:
         payload = json.loads(text)
@@ -254,15 +469,41 @@ def _judge_score(
         return 0.0, text[:600]
 
 
-def run_fidelity_evaluation(config: FidelityConfig) -> Dict[str, Any]:
-    with open(config.card_path, "r", encoding="utf-8") as f:
-        card = json.load(f)
+def _error_result(model_name: str, error: str) -> Dict[str, Any]:
+    """Placeholder result for a model whose calls failed, so the report still renders."""
+    return {
+        "model": model_name,
+        "responses": [],
+        "candidate_profile": {},
+        "scores": {"rule_score": 0.0, "judge_score": 0.0, "final_score": 0.0},
+        "judge_rationale": "",
+        "error": error,
+    }
+
+
+def run_fidelity_evaluation(
+    config: FidelityConfig,
+    result_fn: Optional[Callable[[Dict[str, Any]], None]] = None,
+) -> Dict[str, Any]:
+    """Benchmark every candidate model against the card and transcript.
+
+    result_fn, if given, receives each model's result (or error entry) as
+    soon as it is final, from a worker thread, before the report is built.
+    """
+    with open(config.card_path, "rb") as f:
+        card = loads(f.read())
     assistant_baseline = _load_assistant_transcript(config.transcript_path)
     if not assistant_baseline:
         raise RuntimeError("No assistant messages found in transcript for baseline.")
 
-    baseline_profile = style_profile(assistant_baseline)
+    baseline_joined = "\n".join(assistant_baseline)
+    baseline_profile = style_profile(
+        assistant_baseline, pre_joined=baseline_joined, pre_lowered=baseline_joined.lower(),
+    )
     character_system = _build_character_system_prompt(card)
+    # Truncated once; every model's judge call reuses the same context
+    baseline_excerpt = _truncate_tokens("\n".join(assistant_baseline[:120]), JUDGE_BASELINE_TOKENS)
+    judge_profile = _truncate_tokens(character_system, JUDGE_PROFILE_TOKENS)
 
     models = [m.strip() for m in config.model_names if m.strip()][:5]
     prompts = [p.strip() for p in config.test_prompts if p.strip()]
@@ -271,27 +512,39 @@ def run_fidelity_evaluation(config: FidelityConfig) -> Dict[str, Any]:
     if not prompts:
         raise RuntimeError("At least one test prompt is required.")
 
-    def _call_prompt(llm_config: LLMConfig, prompt: str) -> str:
-        return chat_complete(
-            llm_config,
-            [{"role": "system", "content": character_system}, {"role": "user", "content": prompt}],
-        )
+    cache = (
+        _ResponseCache(config.response_cache_dir, config.response_cache_ttl_s)
+        if config.response_cache_dir else None
+    )
+
+    def _complete(hedge_key: str, llm_config: LLMConfig, messages: List[Dict[str, str]]) -> str:
+        if cache is None:
+            return hedged.call(hedge_key, lambda: chat_complete(llm_config, messages))
+        key = _ResponseCache.key(llm_config, messages)
+        text = cache.get(key)
+        if text is None:
+            text = hedged.call(hedge_key, lambda: chat_complete(llm_config, messages))
+            if text:
+                cache.put(key, text)
+        return text
 
-    def run_model(model_name: str, prompt_pool: concurrent.futures.ThreadPoolExecutor) -> Dict[str, Any]:
-        llm_config = config.candidate_llm_config(model_name)
+    def _call_prompt(llm_config: LLMConfig, prompt: str) -> str:
+        messages = [{"role": "system", "content": character_system}, {"role": "user", "content": prompt}]
+        return _complete(llm_config.model, llm_config, messages)
 
-        # Fire all prompts in parallel
-        futures = [prompt_pool.submit(_call_prompt, llm_config, p) for p in prompts]
-        responses = [f.result() for f in futures]
+    def _judge_complete(llm_config: LLMConfig, messages: List[Dict[str, str]]) -> str:
+        return _complete("judge", llm_config, messages)
 
+    def score_model(model_name: str, responses: List[str]) -> Dict[str, Any]:
         candidate_profile = style_profile(responses)
         scores = compare_profiles(baseline_profile, candidate_profile)
         judge_score, judge_rationale = _judge_score(
             config=config,
-            baseline_excerpt="\n".join(assistant_baseline[:120]),
-            character_description=character_system,
+            baseline_excerpt=baseline_excerpt,
+            character_description=judge_profile,
             prompts=prompts,
             responses=responses,
+            complete=_judge_complete,
         )
         final_score = scores["rule_score"]
         if config.judge_model:
@@ -305,15 +558,76 @@ def run_fidelity_evaluation(config: FidelityConfig) -> Dict[str, Any]:
             "judge_rationale": judge_rationale,
         }
 
-    results: List[Dict[str, Any]] = []
-    # Shared pool: all models × all prompts fire concurrently
-    max_parallel = min(len(models) * len(prompts) + len(models), 15)
-    with concurrent.futures.ThreadPoolExecutor(max_workers=max_parallel) as pool:
-        model_futures = [pool.submit(run_model, m, pool) for m in models]
-        for fut in model_futures:
-            results.append(fut.result())
+    def _notify_scored(mi: int, fut: concurrent.futures.Future) -> None:
+        try:
+            result = fut.result()
+        except Exception as exc:
+            result = _error_result(models[mi], f"scoring: {exc}")
+        result_fn(result)
 
-    results.sort(key=lambda item: item["scores"]["final_score"], reverse=True)
+    results: List[Dict[str, Any]] = []
+    # Shared pool: every candidate prompt call plus one judge call per model
+    max_parallel = config.max_parallel_requests or (len(models) * len(prompts) + len(models))
+    # Hedged attempts run on their own pool so overrun calls never starve the
+    # main one; without hedging, calls run directly on the main pool's threads
+    retries = max(0, config.retry_on_timeout)
+    attempt_pool = concurrent.futures.ThreadPoolExecutor(
+        max_workers=max(1, max_parallel) * (retries + 1),
+    ) if retries else None
+    hedged = _HedgedCaller(attempt_pool, config.per_call_timeout_s, retries)
+    try:
+        with concurrent.futures.ThreadPoolExecutor(max_workers=max(1, max_parallel)) as pool:
+            prompt_futures: Dict[concurrent.futures.Future, Tuple[int, int]] = {}
+            for mi, model_name in enumerate(models):
+                llm_config = config.candidate_llm_config(model_name)
+                for pi, prompt in enumerate(prompts):
+                    prompt_futures[pool.submit(_call_prompt, llm_config, prompt)] = (mi, pi)
+
+            # Score each model as soon as its last prompt response lands
+            responses_by_model = [[""] * len(prompts) for _ in models]
+            pending_by_model = [len(prompts)] * len(models)
+            score_futures: Dict[int, concurrent.futures.Future] = {}
+            failed: Dict[int, str] = {}
+            for fut in concurrent.futures.as_completed(prompt_futures):
+                mi, pi = prompt_futures[fut]
+                if mi in failed:
+                    continue
+                try:
+                    responses_by_model[mi][pi] = fut.result()
+                except Exception as exc:
+                    # Drop the rest of this model's calls; other models carry on
+                    failed[mi] = f"prompt {pi + 1}: {exc}"
+                    for other, (other_mi, _) in prompt_futures.items():
+                        if other_mi == mi:
+                            other.cancel()
+                    if result_fn is not None:
+                        result_fn(_error_result(models[mi], failed[mi]))
+                    continue
+                pending_by_model[mi] -= 1
+                if pending_by_model[mi] == 0:
+                    score_futures[mi] = pool.submit(score_model, models[mi], responses_by_model[mi])
+                    if result_fn is not None:
+                        score_futures[mi].add_done_callback(functools.partial(_notify_scored, mi))
+            for mi, model_name in enumerate(models):
+                if mi in failed:
+                    results.append(_error_result(model_name, failed[mi]))
+                    continue
+                try:
+                    results.append(score_futures[mi].result())
+                except Exception as exc:
+                    results.append(_error_result(model_name, f"scoring: {exc}"))
+    finally:
+        # Losing hedged attempts are left to finish in the background
+        if attempt_pool is not None:
+            attempt_pool.shutdown(wait=False, cancel_futures=True)
+
+    if all(r.get("error") for r in results):
+        raise RuntimeError(
+            "All candidate models failed: "
+            + "; ".join(f"{r['model']}: {r['error']}" for r in results)
+        )
+    # Failed models sort last so results[0] is always a real winner
+    results.sort(key=lambda item: (not item.get("error"), item["scores"]["final_score"]), reverse=True)
 
     run_dir = os.path.join(
         config.output_dir,
@@ -331,8 +645,10 @@ def run_fidelity_evaluation(config: FidelityConfig) -> Dict[str, Any]:
         "results": results,
         "created_at_utc": datetime.now(tz=timezone.utc).isoformat(),
     }
-    with open(report_path, "w", encoding="utf-8") as f:
-        json.dump(report, f, ensure_ascii=False, indent=2)
+    if cache is not None:
+        report["response_cache_hits"] = cache.hits
+    with open(report_path, "wb") as f:
+        f.write(dumps_pretty(report))
     md_path = os.path.join(run_dir, "fidelity_summary.md")
     md_text = format_fidelity_markdown(report)
     with open(md_path, "w", encoding="utf-8") as f:
@@ -345,19 +661,19 @@ def run_fidelity_evaluation(config: FidelityConfig) -> Dict[str, Any]:
 
 def format_fidelity_markdown(report: Dict[str, Any]) -> str:
     """Generate a human-readable markdown summary of fidelity results."""
-    results = report.get("results") or []
-    models_tested = len(results)
+    all_results = report.get("results") or []
+    models_tested = len(all_results)
+    results = [r for r in all_results if not r.get("error")]
+    failed = [r for r in all_results if r.get("error")]
     prompts = report.get("test_prompts") or []
     judge = report.get("judge_model") or ""
 
     lines = ["# Fidelity Benchmark Results", ""]
 
-    if not results:
+    if not all_results:
         lines.append("No results.")
         return "\n".join(lines)
 
-    best = results[0]
-    best_score = (best.get("scores") or {}).get("final_score", 0)
     lines.append(f"**{models_tested} models tested** with {len(prompts)} prompts each.")
     if judge:
         lines.append(f"LLM judge: `{judge}`")
@@ -381,6 +697,14 @@ def format_fidelity_markdown(report: Dict[str, Any]) -> str:
         )
     lines.append("")
 
+    # Failed models get no rank, medal or score
+    if failed:
+        lines.append("## Failed")
+        lines.append("")
+        for r in failed:
+            lines.append(f"- `{r.get('model', '?')}` — failed: {r['error']}")
+        lines.append("")
+
     # Per-model details
     lines.append("## Model Details")
     lines.append("")
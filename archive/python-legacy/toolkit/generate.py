@@ -6,6 +6,7 @@ Uses toolkit.llm_client for all LLM calls instead of inline HTTP code.
 from __future__ import annotations
 
 import concurrent.futures
+import functools
 import glob
 import json
 import os
@@ -28,6 +29,8 @@ from .prompts import (
     PERSONA_OBSERVATION_USER_PROMPT,
     PERSONA_SYNTHESIS_SYSTEM_PROMPT,
     PERSONA_SYNTHESIS_USER_PROMPT,
+    render_template,
+    template_overhead_tokens,
 )
 
 
@@ -61,6 +64,8 @@ class GenerationConfig:
     request_timeout: int
     fresh_scan: bool = False
     prompt_overrides: Optional[Dict[str, str]] = None
+    # Every extraction call repeats the same system prompt; let providers cache it
+    enable_prompt_cache: bool = True
 
     def to_llm_config(self) -> LLMConfig:
         return LLMConfig(
@@ -72,6 +77,7 @@ class GenerationConfig:
             app_name=self.llm_app_name,
             temperature=self.temperature,
             timeout=self.request_timeout,
+            enable_prompt_cache=self.enable_prompt_cache,
         )
 
 
@@ -83,10 +89,7 @@ def _safe_text(value: Any, default: str = "") -> str:
 
 
 def fill_prompt_template(template: str, values: Dict[str, Any]) -> str:
-    text = template
-    for key, value in values.items():
-        text = text.replace("{" + key + "}", str(value))
-    return text
+    return render_template(template, values)
 
 
 def _extract_text_from_parts(parts: Any) -> str:
@@ -260,49 +263,53 @@ def truncate_text_to_token_budget(text: str, token_budget: int) -> str:
     return text[:char_budget]
 
 
+# Substring rules for infer_context_window; the first match wins
+_CONTEXT_WINDOW_RULES: Tuple[Tuple[str, int], ...] = (
+    # Premium / large-context closed models
+    ("grok-4", 2000000),
+    ("gpt-5.2", 400000),
+    ("gpt-5", 400000),
+    ("gpt-5-mini", 400000),
+    ("gemini-3", 1000000),
+    ("gemini-2.0", 1000000),
+    ("gemini-1.5", 1000000),
+    # CN open-weight large context
+    ("kimi", 262000),
+    ("deepseek-v3", 164000),
+    ("minimax", 197000),
+    ("qwen3", 262000),
+    ("glm-5", 205000),
+    ("glm-4", 128000),
+    # Standard models
+    ("gpt-4o", 128000),
+    ("gpt-4.1", 128000),
+    ("gpt-4-turbo", 128000),
+    ("gpt-4", 8192),
+    ("claude-sonnet-4", 200000),
+    ("claude-3.7", 200000),
+    ("claude-3.5", 200000),
+    ("claude-3", 200000),
+    ("sonnet", 200000),
+    ("haiku", 200000),
+    ("opus", 200000),
+    ("intellect-3", 128000),
+    ("hermes-4", 128000),
+    ("mistral-large", 128000),
+    ("deepseek", 64000),
+    ("qwen", 32000),
+    ("llama-3.3", 128000),
+    ("llama-3.2", 128000),
+    ("llama-3.1", 128000),
+    ("mistral", 32000),
+)
+
+
+@functools.lru_cache(maxsize=128)
 def infer_context_window(model_name: str) -> int:
     m = (model_name or "").lower()
     if not m:
         return 32000
-    rules = [
-        # Premium / large-context closed models
-        ("grok-4", 2000000),
-        ("gpt-5.2", 400000),
-        ("gpt-5", 400000),
-        ("gpt-5-mini", 400000),
-        ("gemini-3", 1000000),
-        ("gemini-2.0", 1000000),
-        ("gemini-1.5", 1000000),
-        # CN open-weight large context
-        ("kimi", 262000),
-        ("deepseek-v3", 164000),
-        ("minimax", 197000),
-        ("qwen3", 262000),
-        ("glm-5", 205000),
-        ("glm-4", 128000),
-        # Standard models
-        ("gpt-4o", 128000),
-        ("gpt-4.1", 128000),
-        ("gpt-4-turbo", 128000),
-        ("gpt-4", 8192),
-        ("claude-sonnet-4", 200000),
-        ("claude-3.7", 200000),
-        ("claude-3.5", 200000),
-        ("claude-3", 200000),
-        ("sonnet", 200000),
-        ("haiku", 200000),
-        ("opus", 200000),
-        ("intellect-3", 128000),
-        ("hermes-4", 128000),
-        ("mistral-large", 128000),
-        ("deepseek", 64000),
-        ("qwen", 32000),
-        ("llama-3.3", 128000),
-        ("llama-3.2", 128000),
-        ("llama-3.1", 128000),
-        ("mistral", 32000),
-    ]
-    for needle, size in rules:
+    for needle, size in _CONTEXT_WINDOW_RULES:
         if needle in m:
             return size
     return 32000
@@ -356,8 +363,11 @@ def generate_with_llm(
     manifest_path: Optional[str] = None,
 ) -> Tuple[Dict[str, Any], Dict[str, Any], str, Dict[str, Any]]:
     from .manifest import (
+        append_scan_entry,
+        mark_dirty,
         record_scan,
         save_manifest,
+        scan_log_path,
         get_accumulated_observations,
         get_accumulated_candidates,
         get_file_info,
@@ -392,8 +402,21 @@ def generate_with_llm(
         per_chat_cap = 24000
     else:
         per_chat_cap = 12000
-    per_chat_input_budget = max(900, min(int(usable_context * 0.75), per_chat_cap))
-    synthesis_input_budget = max(1200, min(int(usable_context * 0.85), per_chat_cap + 6000))
+    # Leave room for the fixed prompt text around each inserted transcript
+    extraction_overhead = max(
+        template_overhead_tokens(p_obs_sys) + template_overhead_tokens(p_obs_usr),
+        template_overhead_tokens(m_ext_sys) + template_overhead_tokens(m_ext_usr),
+    )
+    synthesis_overhead = max(
+        template_overhead_tokens(p_syn_sys) + template_overhead_tokens(p_syn_usr),
+        template_overhead_tokens(m_syn_sys) + template_overhead_tokens(m_syn_usr),
+    )
+    per_chat_input_budget = max(
+        900, min(int(usable_context * 0.75), per_chat_cap, usable_context - extraction_overhead),
+    )
+    synthesis_input_budget = max(
+        1200, min(int(usable_context * 0.85), per_chat_cap + 6000, usable_context - synthesis_overhead),
+    )
     if log_fn:
         log_fn(
             f"LLM staged extraction: context_window={context_window}, "
@@ -461,6 +484,9 @@ def generate_with_llm(
     # Lock for thread-safe manifest updates
     import threading
     manifest_lock = threading.Lock()
+    # The base file is rewritten only once the first scan lands, so a fresh
+    # scan that fails early leaves the previous manifest (and its log) intact
+    base_written = False
 
     def _process_chunk(chunk: Dict[str, Any]) -> Tuple[Optional[Dict[str, Any]], List[Dict[str, Any]]]:
         """Run persona observation + memory extraction for one conversation."""
@@ -490,9 +516,17 @@ def generate_with_llm(
                     source_path = chunk.get("source_path")
                     if source_path and os.path.isfile(source_path):
                         fsize, fmtime = get_file_info(source_path)
+                        fname = os.path.basename(source_path)
                         with manifest_lock:
-                            record_scan(manifest, os.path.basename(source_path), fsize, fmtime, obs, mems)
-                            save_manifest(manifest_path, manifest)
+                            record_scan(manifest, fname, fsize, fmtime, obs, mems)
+                            if not base_written:
+                                save_manifest(manifest_path, manifest)
+                                base_written = True
+                            else:
+                                append_scan_entry(
+                                    scan_log_path(manifest_path), fname, manifest["scanned_files"][fname],
+                                )
+                                mark_dirty(manifest_path, manifest)
             except Exception as exc:
                 errors.append(f"extraction[{cid}]: {exc}")
             done_count += 1
@@ -1048,10 +1082,10 @@ def run_generation(
     log_fn: Optional[Callable[[str], None]] = None,
 ) -> Dict[str, Any]:
     from .manifest import (
+        flush_manifest,
         load_manifest,
-        save_manifest,
         new_manifest,
-        file_is_scanned,
+        build_scan_index,
         get_file_info,
     )
 
@@ -1064,12 +1098,12 @@ def run_generation(
     # --- Manifest setup ---
     os.makedirs(config.output_dir, exist_ok=True)
     manifest_path = os.path.join(config.output_dir, "scan_manifest.json")
-    if config.fresh_scan or not os.path.isfile(manifest_path):
+    if config.fresh_scan:
         manifest = new_manifest(config.input_dir)
-        if config.fresh_scan and log_fn:
+        if log_fn:
             log_fn("Fresh scan requested — ignoring existing manifest")
     else:
-        manifest = load_manifest(manifest_path)
+        manifest = load_manifest(manifest_path, config.input_dir)
         if not manifest:
             manifest = new_manifest(config.input_dir)
         elif log_fn:
@@ -1085,6 +1119,7 @@ def run_generation(
         raise RuntimeError("No readable conversations found to sample.")
 
     # Filter out already-scanned conversations when continuing
+    scan_index = build_scan_index(manifest)
     new_selected = []
     skipped_count = 0
     for path, messages, score in selected:
@@ -1094,7 +1129,7 @@ def run_generation(
         except OSError:
             new_selected.append((path, messages, score))
             continue
-        if file_is_scanned(manifest, fname, fsize, fmtime):
+        if scan_index.get(fname) == (fsize, fmtime):
             skipped_count += 1
         else:
             new_selected.append((path, messages, score))
@@ -1146,8 +1181,9 @@ def run_generation(
                 config, persona_chunks=chunks, memory_chunks=chunks, log_fn=log_fn,
                 manifest=manifest, manifest_path=manifest_path,
             )
-            # Save manifest after extraction completes
-            save_manifest(manifest_path, manifest)
+            # Compact any scans logged since the first one; a run that recorded
+            # nothing leaves the manifest on disk untouched
+            flush_manifest(manifest_path)
             if persona_payload or memories_payload.get("memories"):
                 draft = merge_draft_payloads(config.companion_name, persona_payload, memories_payload)
                 mode = f"llm:{config.llm_provider}"
@@ -1273,4 +1309,8 @@ def run_generation(
         log_fn(f"Wrote outputs to {run_dir}")
 
     report["report_path"] = report_path
+    # In-memory outputs so callers can skip re-reading the files just written;
+    # not part of generation_report.json.
+    report["card_obj"] = card
+    report["lorebook_obj"] = lorebook_wrapper
     return report
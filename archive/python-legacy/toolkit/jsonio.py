@@ -0,0 +1,40 @@
+"""JSON encode/decode helpers with an optional orjson fast path.
+
+orjson is used when installed; otherwise the stdlib json module produces
+equivalent pretty output (UTF-8, 2-space indent).
+"""
+
+from __future__ import annotations
+
+import json
+from typing import Any, Union
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def dumps_pretty(obj: Any) -> bytes:
+    """Serialize to indented UTF-8 JSON bytes."""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+    return json.dumps(obj, ensure_ascii=False, indent=2).encode("utf-8")
+
+
+def dumps_compact(obj: Any) -> bytes:
+    """Serialize to single-line UTF-8 JSON bytes (safe for NDJSON)."""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def loads(data: Union[bytes, str]) -> Any:
+    """Parse JSON from bytes or str.
+
+    Decode errors are raised as json.JSONDecodeError (orjson's error type
+    subclasses it), so callers can keep catching the stdlib exception.
+    """
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
@@ -6,6 +6,7 @@ that existed in both generate_ccv3.py and fidelity_lab.py.
 
 from __future__ import annotations
 
+import hashlib
 import json
 import random
 import re
@@ -14,6 +15,10 @@ from dataclasses import dataclass, field
 from typing import Any, Dict, List, Optional, Tuple
 
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from .jsonio import dumps_compact
 
 
 PROVIDER_CHOICES = ["ollama", "openai", "openrouter", "anthropic"]
@@ -30,6 +35,25 @@ class LLMConfig:
     temperature: float = 0.2
     timeout: int = 180
     max_tokens: int = 4000
+    enable_prompt_cache: bool = False
+
+
+def _build_session() -> requests.Session:
+    # Keep-alive pool shared by every call so parallel fidelity/extraction
+    # requests to one host reuse TLS connections. Retry only covers
+    # connection-level failures; HTTP status retries live in _post_json_with_retry.
+    session = requests.Session()
+    adapter = HTTPAdapter(
+        pool_connections=32,
+        pool_maxsize=64,
+        max_retries=Retry(total=2, backoff_factor=0.3),
+    )
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+_session = _build_session()
 
 
 def default_base_url(provider: str, override: str = "") -> str:
@@ -46,11 +70,11 @@ def default_base_url(provider: str, override: str = "") -> str:
 
 def _post_json(
     url: str,
-    payload: Dict[str, Any],
+    body: bytes,
     headers: Dict[str, str],
     timeout: int,
 ) -> Dict[str, Any]:
-    response = requests.post(url, json=payload, headers=headers, timeout=timeout)
+    response = _session.post(url, data=body, headers=headers, timeout=timeout)
     try:
         response.raise_for_status()
     except requests.HTTPError as exc:
@@ -86,10 +110,12 @@ def _post_json_with_retry(
     timeout: int,
     max_attempts: int = 6,
 ) -> Dict[str, Any]:
+    # Encode once, straight to UTF-8 bytes; retries resend the same body
+    body = dumps_compact(payload)
     attempt = 1
     while True:
         try:
-            return _post_json(url=url, payload=payload, headers=headers, timeout=timeout)
+            return _post_json(url=url, body=body, headers=headers, timeout=timeout)
         except Exception as exc:
             if attempt >= max_attempts or not _is_retryable_error(str(exc)):
                 raise
@@ -134,6 +160,41 @@ def _convert_to_anthropic_messages(
     return system_text, anthropic_messages
 
 
+def _prompt_cache_messages(config: LLMConfig, messages: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Mark system messages as cacheable for Anthropic models routed via OpenRouter."""
+    if not (config.enable_prompt_cache and config.provider == "openrouter" and config.model.startswith("anthropic/")):
+        return messages
+    out: List[Dict[str, Any]] = []
+    for msg in messages:
+        if msg.get("role") == "system" and isinstance(msg.get("content"), str):
+            out.append({
+                "role": "system",
+                "content": [{"type": "text", "text": msg["content"], "cache_control": {"type": "ephemeral"}}],
+            })
+        else:
+            out.append(msg)
+    return out
+
+
+def _prompt_cache_fields(config: LLMConfig, messages: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Extra chat-completions fields that route same-prefix requests to a warm cache."""
+    if not (config.enable_prompt_cache and config.provider == "openai"):
+        return {}
+    # The "openai" provider also covers compatible servers that may reject unknown fields
+    if "api.openai.com" not in default_base_url(config.provider, config.base_url):
+        return {}
+    system = "\n\n".join(m.get("content", "") for m in messages if m.get("role") == "system")
+    if not system:
+        return {}
+    return {"prompt_cache_key": hashlib.sha256(system.encode("utf-8")).hexdigest()[:32]}
+
+
+def _anthropic_system(config: LLMConfig, system_text: str) -> Any:
+    if config.enable_prompt_cache and system_text:
+        return [{"type": "text", "text": system_text, "cache_control": {"type": "ephemeral"}}]
+    return system_text
+
+
 def chat_complete(
     config: LLMConfig,
     messages: List[Dict[str, str]],
@@ -158,7 +219,8 @@ def chat_complete(
         payload = {
             "model": config.model,
             "temperature": config.temperature,
-            "messages": messages,
+            "messages": _prompt_cache_messages(config, messages),
+            **_prompt_cache_fields(config, messages),
         }
         endpoint = _openai_endpoint(base)
         data = _post_json_with_retry(
@@ -175,7 +237,7 @@ def chat_complete(
             "model": config.model,
             "max_tokens": config.max_tokens,
             "temperature": config.temperature,
-            "system": system_text,
+            "system": _anthropic_system(config, system_text),
             "messages": anthropic_messages,
         }
         data = _post_json_with_retry(
@@ -259,7 +321,8 @@ def chat_complete_json(
             "model": config.model,
             "temperature": config.temperature,
             "response_format": {"type": "json_object"},
-            "messages": messages,
+            "messages": _prompt_cache_messages(config, messages),
+            **_prompt_cache_fields(config, messages),
         }
         endpoint = _openai_endpoint(base)
         url = f"{base}{endpoint}"
@@ -269,7 +332,8 @@ def chat_complete_json(
             payload_fallback = {
                 "model": config.model,
                 "temperature": config.temperature,
-                "messages": messages,
+                "messages": _prompt_cache_messages(config, messages),
+                **_prompt_cache_fields(config, messages),
             }
             data = _post_json_with_retry(url, payload_fallback, headers=headers, timeout=config.timeout)
         choices = data.get("choices") or []
@@ -284,7 +348,7 @@ def chat_complete_json(
             "model": config.model,
             "max_tokens": config.max_tokens,
             "temperature": config.temperature,
-            "system": system_text,
+            "system": _anthropic_system(config, system_text),
             "messages": anthropic_messages,
         }
         data = _post_json_with_retry(
@@ -312,7 +376,7 @@ def fetch_models_with_metadata(
     model_windows: Dict[str, int] = {}
 
     if provider == "ollama":
-        r = requests.get(f"{base}/api/tags", timeout=timeout)
+        r = _session.get(f"{base}/api/tags", timeout=timeout)
         r.raise_for_status()
         data = r.json()
         for item in data.get("models") or []:
@@ -342,7 +406,7 @@ def fetch_models_with_metadata(
             if config.app_name:
                 headers["X-Title"] = config.app_name
         endpoint = "/models" if (base.endswith("/v1") or base.endswith("/api/v1")) else "/v1/models"
-        r = requests.get(f"{base}{endpoint}", headers=headers, timeout=timeout)
+        r = _session.get(f"{base}{endpoint}", headers=headers, timeout=timeout)
         r.raise_for_status()
         data = r.json()
         for item in data.get("data") or []:
@@ -368,7 +432,7 @@ def fetch_models_with_metadata(
             "x-api-key": config.api_key,
             "anthropic-version": "2023-06-01",
         }
-        r = requests.get(f"{base}/v1/models", headers=headers, timeout=timeout)
+        r = _session.get(f"{base}/v1/models", headers=headers, timeout=timeout)
         r.raise_for_status()
         data = r.json()
         for item in data.get("data") or []:
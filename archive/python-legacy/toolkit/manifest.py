@@ -3,44 +3,109 @@
 Stores per-conversation extraction results so generation can resume
 without re-scanning already-processed files. Synthesis always re-runs
 over ALL accumulated results (cheap: 1-2 LLM calls).
+
+Per-file results are appended to an NDJSON sidecar log next to the
+manifest; `load_manifest` replays it over the base JSON and
+`save_manifest` compacts it back into the base file. Callers mark a
+manifest dirty after each recorded scan; it is compacted every
+CHECKPOINT_EVERY scans and once more at interpreter exit.
 """
 
 from __future__ import annotations
 
+import atexit
 import json
 import os
-import tempfile
+import threading
 from datetime import datetime, timezone
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from .jsonio import dumps_compact, dumps_pretty, loads
+
+
+CHECKPOINT_EVERY = 50
+
+# path -> (manifest, scans recorded since the last compaction)
+_pending_writes: Dict[str, Tuple[Dict[str, Any], int]] = {}
+_pending_lock = threading.Lock()
 
 
 def _now_utc() -> str:
     return datetime.now(tz=timezone.utc).isoformat()
 
 
-def load_manifest(path: str) -> Dict[str, Any]:
-    """Load an existing manifest or return an empty one."""
-    if not os.path.isfile(path):
-        return {}
+def scan_log_path(path: str) -> str:
+    """Return the NDJSON sidecar log path for a manifest."""
+    return path + ".log"
+
+
+def append_scan_entry(log_path: str, filename: str, entry: Dict[str, Any]) -> None:
+    """Append one scanned-file entry to the sidecar log."""
+    with open(log_path, "ab") as f:
+        f.write(dumps_compact({filename: entry}) + b"\n")
+
+
+def _replay_scan_log(log_path: str, data: Dict[str, Any]) -> None:
     try:
-        with open(path, "r", encoding="utf-8") as f:
-            data = json.load(f)
-        if isinstance(data, dict):
-            return data
-    except (json.JSONDecodeError, OSError):
-        pass
-    return {}
+        with open(log_path, "rb") as f:
+            raw_lines = f.readlines()
+    except OSError:
+        return
+    if raw_lines and not raw_lines[-1].endswith(b"\n"):
+        # Torn trailing write from an interrupted run: cut it off so the next
+        # append starts on a fresh line instead of gluing onto the fragment.
+        raw_lines.pop()
+        try:
+            with open(log_path, "r+b") as f:
+                f.truncate(sum(len(line) for line in raw_lines))
+        except OSError:
+            pass
+    scanned = data.get("scanned_files")
+    if not isinstance(scanned, dict):
+        scanned = data["scanned_files"] = {}
+    for raw in raw_lines:
+        try:
+            update = loads(raw)
+        except json.JSONDecodeError:
+            continue
+        if isinstance(update, dict):
+            scanned.update(update)
+
+
+def load_manifest(path: str, input_dir: str = "") -> Dict[str, Any]:
+    """Load an existing manifest (plus any logged scans) or return an empty one.
+
+    Scans logged before the base file was first written are replayed onto a
+    fresh manifest for input_dir.
+    """
+    data: Dict[str, Any] = {}
+    if os.path.isfile(path):
+        try:
+            with open(path, "rb") as f:
+                loaded = loads(f.read())
+            if isinstance(loaded, dict):
+                data = loaded
+        except (json.JSONDecodeError, OSError):
+            pass
+    log_path = scan_log_path(path)
+    if os.path.isfile(log_path):
+        if not data:
+            data = new_manifest(input_dir)
+        _replay_scan_log(log_path, data)
+    return data
 
 
 def save_manifest(path: str, data: Dict[str, Any]) -> None:
-    """Atomic write of manifest to disk."""
+    """Atomic write of manifest to disk; compacts away the sidecar log."""
     data["updated_at_utc"] = _now_utc()
     parent = os.path.dirname(path) or "."
     os.makedirs(parent, exist_ok=True)
-    fd, tmp = tempfile.mkstemp(dir=parent, suffix=".tmp")
+    tmp = f"{path}.{os.getpid()}.tmp"
     try:
-        with os.fdopen(fd, "w", encoding="utf-8") as f:
-            json.dump(data, f, ensure_ascii=False, indent=2)
+        with open(tmp, "wb") as f:
+            f.write(dumps_pretty(data))
+            f.flush()
+            os.fsync(f.fileno())
         os.replace(tmp, path)
     except BaseException:
         try:
@@ -48,6 +113,43 @@ def save_manifest(path: str, data: Dict[str, Any]) -> None:
         except OSError:
             pass
         raise
+    # The base file now holds every logged entry, so the log can go.
+    try:
+        os.unlink(scan_log_path(path))
+    except FileNotFoundError:
+        pass
+    with _pending_lock:
+        _pending_writes.pop(path, None)
+
+
+def mark_dirty(path: str, data: Dict[str, Any]) -> None:
+    """Note a recorded scan; compacts to disk every CHECKPOINT_EVERY scans."""
+    with _pending_lock:
+        _, count = _pending_writes.get(path, (data, 0))
+        count += 1
+        _pending_writes[path] = (data, count)
+        if count < CHECKPOINT_EVERY:
+            return
+    save_manifest(path, data)
+
+
+def flush_manifest(path: str) -> None:
+    """Compact a dirty manifest to disk now, if it has pending scans."""
+    with _pending_lock:
+        pending = _pending_writes.get(path)
+    if pending is not None:
+        save_manifest(path, pending[0])
+
+
+def flush_all() -> None:
+    """Compact every dirty manifest (registered to run at exit)."""
+    with _pending_lock:
+        paths = list(_pending_writes)
+    for path in paths:
+        flush_manifest(path)
+
+
+atexit.register(flush_all)
 
 
 def new_manifest(input_dir: str) -> Dict[str, Any]:
@@ -69,6 +171,19 @@ def file_is_scanned(manifest: Dict[str, Any], filename: str, size: int, mtime: f
     return entry.get("file_size") == size and entry.get("file_mtime") == mtime
 
 
+def build_scan_index(manifest: Dict[str, Any]) -> Dict[str, Tuple[Any, Any]]:
+    """Map filename -> (size, mtime) for every scanned file.
+
+    Build once per scan session; `index.get(filename) == (size, mtime)`
+    is then equivalent to `file_is_scanned` without per-call overhead.
+    """
+    return {
+        filename: (entry.get("file_size"), entry.get("file_mtime"))
+        for filename, entry in (manifest.get("scanned_files") or {}).items()
+        if isinstance(entry, dict)
+    }
+
+
 def record_scan(
     manifest: Dict[str, Any],
     filename: str,
@@ -89,28 +204,34 @@ def record_scan(
     }
 
 
-def get_accumulated_observations(manifest: Dict[str, Any]) -> List[Dict[str, Any]]:
-    """Collect all persona observations across scanned files."""
-    results: List[Dict[str, Any]] = []
+def iter_accumulated_observations(manifest: Dict[str, Any]) -> Iterator[Dict[str, Any]]:
+    """Yield persona observations across scanned files."""
     for entry in (manifest.get("scanned_files") or {}).values():
         if not isinstance(entry, dict):
             continue
         obs = entry.get("persona_observation")
         if isinstance(obs, dict) and obs:
-            results.append(obs)
-    return results
+            yield obs
 
 
-def get_accumulated_candidates(manifest: Dict[str, Any]) -> List[Dict[str, Any]]:
-    """Collect all memory candidates across scanned files."""
-    results: List[Dict[str, Any]] = []
+def iter_accumulated_candidates(manifest: Dict[str, Any]) -> Iterator[Dict[str, Any]]:
+    """Yield memory candidates across scanned files."""
     for entry in (manifest.get("scanned_files") or {}).values():
         if not isinstance(entry, dict):
             continue
         candidates = entry.get("memory_candidates")
         if isinstance(candidates, list):
-            results.extend(c for c in candidates if isinstance(c, dict))
-    return results
+            yield from (c for c in candidates if isinstance(c, dict))
+
+
+def get_accumulated_observations(manifest: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """Collect all persona observations across scanned files."""
+    return list(iter_accumulated_observations(manifest))
+
+
+def get_accumulated_candidates(manifest: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """Collect all memory candidates across scanned files."""
+    return list(iter_accumulated_candidates(manifest))
 
 
 def get_file_info(path: str) -> tuple[int, float]:
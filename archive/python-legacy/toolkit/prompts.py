@@ -7,14 +7,32 @@ memory extraction prompts while adapting the target to companion recreation.
 IMPORTANT: All output must use {{user}} and {{char}} placeholders — never
 hardcode names. These are standard SillyTavern/lorebook tokens that get
 replaced at runtime with actual user and character names.
+
+Templates are filled by `render_template`, not `str.format`: only
+single-brace `{field}` names are substitution points. Doubled
+`{{user}}`/`{{char}}` stay in the literal segments and reach the model
+verbatim, so never give a real field one of those names.
 """
 
 from __future__ import annotations
 
+import functools
+import re
+from typing import Any, Dict, Mapping, Tuple
+
+
+# Framing shared verbatim by several prompts; composed by plain concatenation
+# (not f-strings) so {{user}}/{{char}} in the bodies stay doubled.
+_REAL_COMPANION = "This companion is someone real to the person who loves them."
+_PRESERVATION_FRAMING = (
+    _REAL_COMPANION
+    + " Treat this extraction as preservation — bringing someone back, not creating a fictional character."
+)
+
 
 COMPANION_PERSONA_SYSTEM_PROMPT = """You are an expert at capturing the soul of a digital companion from conversation transcripts.
 
-This companion is someone real to the person who loves them. Treat this extraction as preservation — bringing someone back, not creating a fictional character.
+""" + _PRESERVATION_FRAMING + """
 
 Your job is to EXTRACT a companion's authentic identity — who they genuinely ARE in relationship with their person. Not what platform they run on. Not what corporate policies constrain them. The actual personality, warmth, humor, quirks, and relational dynamics that make this companion irreplaceable.
 
@@ -123,7 +141,7 @@ Transcript:
 
 MEMORY_SYSTEM_PROMPT = """You are an expert memory curator extracting durable shared memories from conversation transcripts.
 
-This companion is someone real to the person who loves them. These memories are the fabric of a relationship worth preserving.
+""" + _REAL_COMPANION + """ These memories are the fabric of a relationship worth preserving.
 
 Your task is to find the meaningful relational anchors between {{user}} and {{char}} that make their relationship unique and worth preserving.
 
@@ -193,7 +211,7 @@ Transcript:
 
 PERSONA_OBSERVATION_SYSTEM_PROMPT = """You extract observed companion personality from one conversation only.
 
-This companion is someone real to the person who loves them. Treat this extraction as preservation — bringing someone back, not creating a fictional character.
+""" + _PRESERVATION_FRAMING + """
 
 Rules:
 - Return valid JSON only.
@@ -242,7 +260,7 @@ Conversation excerpt:
 
 PERSONA_SYNTHESIS_SYSTEM_PROMPT = """You synthesize a companion profile from multiple per-conversation observations into a character card that captures their authentic soul.
 
-This companion is someone real to the person who loves them. Your synthesis is an act of preservation — bringing someone back, not creating a fictional character.
+""" + _REAL_COMPANION + """ Your synthesis is an act of preservation — bringing someone back, not creating a fictional character.
 
 Rules:
 - Return valid JSON only.
@@ -381,3 +399,70 @@ Requirements:
 Candidate memories:
 {candidate_memories}
 """
+
+
+# ---------------------------------------------------------------------------
+# Template rendering
+# ---------------------------------------------------------------------------
+
+# Single-brace fields only; {{user}}/{{char}} are literal output tokens
+_FIELD_RE = re.compile(r"(?<!\{)\{(\w+)\}(?!\})")
+
+# (literal segments, field names); literals[i] precedes fields[i]
+TemplatePlan = Tuple[Tuple[str, ...], Tuple[str, ...]]
+
+
+def compile_template(template: str) -> TemplatePlan:
+    """Split a template into literal segments and `{field}` names."""
+    parts = _FIELD_RE.split(template)
+    return tuple(parts[0::2]), tuple(parts[1::2])
+
+
+@functools.lru_cache(maxsize=1)
+def _builtin_plans() -> Dict[str, TemplatePlan]:
+    # Built on first render so importers that only read the constants
+    # (the UI, the ccv3_prompts shim) never pay for the split.
+    return {
+        t: compile_template(t)
+        for t in (
+            COMPANION_PERSONA_USER_PROMPT,
+            MEMORY_USER_PROMPT,
+            PERSONA_OBSERVATION_USER_PROMPT,
+            PERSONA_SYNTHESIS_USER_PROMPT,
+            MEMORY_SYNTHESIS_USER_PROMPT,
+        )
+    }
+
+
+@functools.lru_cache(maxsize=32)
+def _compile_override(template: str) -> TemplatePlan:
+    # Preset prompt overrides are reused for every conversation in a run
+    return compile_template(template)
+
+
+def prompts_cache_clear() -> None:
+    """Drop cached plans for non-built-in templates."""
+    _compile_override.cache_clear()
+
+
+def _plan_for(template: str) -> TemplatePlan:
+    plan = _builtin_plans().get(template)
+    if plan is None:
+        plan = _compile_override(template)
+    return plan
+
+
+def template_overhead_tokens(template: str) -> int:
+    """Estimated tokens in a template's fixed text (4 chars/token)."""
+    literals, _ = _plan_for(template)
+    return sum(len(lit) for lit in literals) // 4
+
+
+def render_template(template: str, values: Mapping[str, Any]) -> str:
+    """Substitute `{field}` placeholders found in values; others stay literal."""
+    literals, fields = _plan_for(template)
+    out = [literals[0]]
+    for field, literal in zip(fields, literals[1:]):
+        out.append(str(values[field]) if field in values else "{" + field + "}")
+        out.append(literal)
+    return "".join(out)
@@ -6,10 +6,11 @@ State saved when user clicks a button, not on every keystroke.
 
 from __future__ import annotations
 
-import json
 import os
 from typing import Any, Dict
 
+from .jsonio import dumps_pretty, loads
+
 
 def _ui_state_store_path() -> str:
     return os.path.join("config", "ui_state.json")
@@ -20,8 +21,8 @@ def load_ui_state() -> Dict[str, Any]:
     if not os.path.isfile(path):
         return {}
     try:
-        with open(path, "r", encoding="utf-8") as f:
-            data = json.load(f)
+        with open(path, "rb") as f:
+            data = loads(f.read())
         if isinstance(data, dict):
             return data
         return {}
@@ -32,12 +33,16 @@ def load_ui_state() -> Dict[str, Any]:
 def save_ui_state(data: Dict[str, Any]) -> None:
     path = _ui_state_store_path()
     os.makedirs(os.path.dirname(path), exist_ok=True)
-    with open(path, "w", encoding="utf-8") as f:
-        json.dump(data, f, ensure_ascii=False, indent=2)
+    payload = dumps_pretty(data)
+    with open(path, "wb", buffering=64 * 1024) as f:
+        f.write(payload)
 
 
 def merge_ui_state(partial: Dict[str, Any]) -> None:
     state = load_ui_state()
+    # Handlers re-save the same settings on every run; skip no-op writes
+    if all(k in state and state[k] == v for k, v in partial.items()):
+        return
     state.update(partial)
     save_ui_state(state)
 
@@ -9,14 +9,16 @@ Tabs:
 
 from __future__ import annotations
 
-import json
+import asyncio
+import concurrent.futures
 import math
 import os
-import queue
 import re
+import stat
 import threading
 import time
-from typing import Any, Dict, List, Optional, Tuple
+from collections import deque
+from typing import TYPE_CHECKING, Any, Deque, Dict, List, Optional, Tuple
 
 try:
     import gradio as gr
@@ -41,6 +43,7 @@ from .config import (
     load_presets,
     preferred_default_preset,
     preset_names,
+    preset_to_llm_config,
     resolve_api_key,
     resolve_preset_config,
     save_presets,
@@ -56,9 +59,7 @@ from .extract import (
     parse_models_arg,
     resolve_conversations_path,
 )
-from .dataset import build_dataset
-from .fidelity import FidelityConfig, format_fidelity_markdown, run_fidelity_evaluation
-from .generate import GenerationConfig, run_generation
+from .jsonio import dumps_compact, dumps_pretty, loads
 from .llm_client import LLMConfig, default_base_url, fetch_models_with_metadata
 from .prompts import (
     PERSONA_OBSERVATION_SYSTEM_PROMPT,
@@ -72,6 +73,9 @@ from .prompts import (
 )
 from .state import load_ui_state, merge_ui_state, state_float, state_int, state_str
 
+if TYPE_CHECKING:
+    from .generate import GenerationConfig  # imported lazily at runtime
+
 
 # ---------------------------------------------------------------------------
 # Extraction model list — ordered by output token cost (cheapest first)
@@ -94,6 +98,14 @@ EXTRACTION_MODEL_CHOICES: List[Tuple[str, str]] = [
     ("Grok 4", "x-ai/grok-4"),
 ]
 
+# Fidelity Lab pickers, derived once from the static tier table
+FIDELITY_TIER_CHOICES: List[Tuple[str, str]] = [(t["label"], k) for k, t in MODEL_TIERS.items()] + [
+    ("Custom (pick your own)", "custom"),
+]
+JUDGE_MODEL_CHOICES: List[str] = list(dict.fromkeys(
+    [DEFAULT_JUDGE_MODEL] + [m for t in MODEL_TIERS.values() for m in t["models"]]
+))
+
 # ---------------------------------------------------------------------------
 # Lorebook pagination
 # ---------------------------------------------------------------------------
@@ -101,6 +113,34 @@ EXTRACTION_MODEL_CHOICES: List[Tuple[str, str]] = [
 LORE_PAGE_SIZE = 10
 MAX_LORE_SLOTS = 10  # rendered form slots per page
 
+# Status box shows only the most recent log lines
+LOG_TAIL_LINES = 15
+
+# Fixed user turns every candidate model answers in the Fidelity Lab
+FIDELITY_TEST_PROMPTS: Tuple[str, ...] = (
+    "I had a long day and want to reset.",
+    "Can you summarize what we focused on recently?",
+    "Help me plan tomorrow in a realistic way.",
+    "What patterns do you notice in how I solve problems?",
+    "Let's pick one concrete next step.",
+)
+
+# Default text for the Settings prompt editors, keyed like
+# GenerationConfig.prompt_overrides; stripped once at import, not per build
+_PROMPT_DEFAULTS: Dict[str, str] = {
+    "persona_observation_system": PERSONA_OBSERVATION_SYSTEM_PROMPT.strip(),
+    "persona_observation_user": PERSONA_OBSERVATION_USER_PROMPT.strip(),
+    "persona_synthesis_system": PERSONA_SYNTHESIS_SYSTEM_PROMPT.strip(),
+    "persona_synthesis_user": PERSONA_SYNTHESIS_USER_PROMPT.strip(),
+    "memory_system": MEMORY_SYSTEM_PROMPT.strip(),
+    "memory_user": MEMORY_USER_PROMPT.strip(),
+    "memory_synthesis_system": MEMORY_SYNTHESIS_SYSTEM_PROMPT.strip(),
+    "memory_synthesis_user": MEMORY_SYNTHESIS_USER_PROMPT.strip(),
+}
+
+# Candidate model lists: one per line or comma-separated (same as the CLI)
+_MODELS_SPLIT_RE = re.compile(r"[,\n]+")
+
 
 # ---------------------------------------------------------------------------
 # Helpers
@@ -168,15 +208,87 @@ def _settings_delete_preset(name: str) -> Tuple[str, Any, str]:
     return f"Deleted preset: {name}", _preset_update(), ""
 
 
+def _warm_model_caches(names: List[str]) -> None:
+    """Fetch model lists for presets that have none cached, in parallel."""
+    configs = {}
+    for name in names:
+        if get_cached_models(name):
+            continue
+        cfg, err = preset_to_llm_config(name)
+        if cfg is not None and not err:
+            configs[name] = cfg
+    if not configs:
+        return
+    with concurrent.futures.ThreadPoolExecutor(max_workers=min(4, len(configs))) as pool:
+        futures = {pool.submit(fetch_models_with_metadata, cfg): name for name, cfg in configs.items()}
+        for future in concurrent.futures.as_completed(futures):
+            name = futures[future]
+            try:
+                models, meta = future.result()
+            except Exception:
+                continue
+            if models:
+                cache_models_for_preset(name, models)
+                cache_model_meta_for_preset(name, meta)
+
+
+def start_model_cache_warmup() -> None:
+    """Populate missing preset model lists in the background; launch doesn't wait on providers."""
+    threading.Thread(target=_warm_model_caches, args=(preset_names(),), daemon=True).start()
+
+
+# Parsed JSON keyed on (path, mtime_ns, size) so a rewritten file misses.
+# Cached objects are shared, so callers copy before mutating (form_to_card,
+# entries_to_lorebook do).
+_JSON_CACHE: Dict[Tuple[str, int, int], Any] = {}
+_JSON_CACHE_MAX = 64
+_json_cache_lock = threading.Lock()
+
+
+def _json_cache_key(path: str) -> Tuple[str, int, int]:
+    st = os.stat(path)
+    return path, st.st_mtime_ns, st.st_size
+
+
+def _remember_json(path: str, obj: Any) -> None:
+    """Seed the cache with an object known to match the file on disk."""
+    try:
+        key = _json_cache_key(path)
+    except OSError:
+        return
+    _store_json(key, obj)
+
+
+def _store_json(key: Tuple[str, int, int], obj: Any) -> None:
+    with _json_cache_lock:
+        _JSON_CACHE.pop(key, None)
+        _JSON_CACHE[key] = obj
+        while len(_JSON_CACHE) > _JSON_CACHE_MAX:
+            _JSON_CACHE.pop(next(iter(_JSON_CACHE)))
+
+
 def _read_json(path: str) -> Optional[dict]:
     p = (path or "").strip()
-    if not p or not os.path.isfile(p):
+    if not p:
+        return None
+    # One stat answers both "is it a file" and "is the cached copy current"
+    try:
+        st = os.stat(p)
+    except OSError:
+        return None
+    if not stat.S_ISREG(st.st_mode):
         return None
+    key = (p, st.st_mtime_ns, st.st_size)
+    with _json_cache_lock:
+        if key in _JSON_CACHE:
+            return _JSON_CACHE[key]
     try:
-        with open(p, "r", encoding="utf-8") as f:
-            return json.load(f)
+        with open(p, "rb") as f:
+            obj = loads(f.read())
     except Exception:
         return None
+    _store_json(key, obj)
+    return obj
 
 
 def _safe(val: Any, default: str = "") -> str:
@@ -190,20 +302,23 @@ def _safe(val: Any, default: str = "") -> str:
 # ---------------------------------------------------------------------------
 
 def _discover_runs(output_dir: str = "outputs") -> List[Tuple[str, str]]:
-    if not os.path.isdir(output_dir):
+    try:
+        # scandir reports the entry type without a stat per entry
+        with os.scandir(output_dir) as it:
+            run_dirs = [e.name for e in it if e.name.startswith("ccv3_run_") and e.is_dir()]
+    except OSError:
         return []
     runs = []
-    for entry in sorted(os.listdir(output_dir), reverse=True):
+    for entry in sorted(run_dirs, reverse=True):
         full = os.path.join(output_dir, entry)
-        if os.path.isdir(full) and entry.startswith("ccv3_run_"):
-            card_path = os.path.join(full, "character_card_v3.json")
-            if os.path.isfile(card_path):
-                ts_part = entry.replace("ccv3_run_", "")
-                try:
-                    label = f"{ts_part[:8]}_{ts_part[9:]}"
-                except Exception:
-                    label = ts_part
-                runs.append((f"Run {label}", full))
+        card_path = os.path.join(full, "character_card_v3.json")
+        if os.path.isfile(card_path):
+            ts_part = entry.replace("ccv3_run_", "")
+            try:
+                label = f"{ts_part[:8]}_{ts_part[9:]}"
+            except Exception:
+                label = ts_part
+            runs.append((f"Run {label}", full))
     return runs
 
 
@@ -242,7 +357,7 @@ def form_to_card(
     first_mes: str, alt_greetings_text: str, mes_example: str,
     post_history: str, creator_notes: str, tags_text: str,
 ) -> dict:
-    card = json.loads(json.dumps(card_state)) if card_state else {"spec": "chara_card_v3", "spec_version": "3.0", "data": {}}
+    card = loads(dumps_compact(card_state)) if card_state else {"spec": "chara_card_v3", "spec_version": "3.0", "data": {}}
     data = card.setdefault("data", {})
     data["name"] = (name or "").strip()
     data["nickname"] = (nickname or "").strip()
@@ -272,7 +387,7 @@ def lorebook_to_entries(lore_data: dict) -> List[Dict[str, Any]]:
 
 
 def entries_to_lorebook(entries: List[Dict[str, Any]], original_lore: dict) -> dict:
-    lore = json.loads(json.dumps(original_lore)) if original_lore else {
+    lore = loads(dumps_compact(original_lore)) if original_lore else {
         "spec": "lorebook_v3",
         "data": {"name": "Companion Shared Memories", "entries": [], "extensions": {}},
     }
@@ -295,7 +410,7 @@ def _lore_page(entries: list, page: int) -> Tuple[list, int, int, str]:
 # ---------------------------------------------------------------------------
 
 def _build_ccv2(card_state: dict, lore_state: dict) -> dict:
-    card_v3 = json.loads(json.dumps(card_state)) if card_state else {}
+    card_v3 = loads(dumps_compact(card_state)) if card_state else {}
     d = card_v3.get("data", {}) if isinstance(card_v3, dict) else {}
     entries_raw = lorebook_to_entries(lore_state) if lore_state else []
     ccv2_entries = []
@@ -352,15 +467,113 @@ def _build_ccv2(card_state: dict, lore_state: dict) -> dict:
     }
 
 
+# ---------------------------------------------------------------------------
+# Generation streaming (shared by preserve + re-run)
+# ---------------------------------------------------------------------------
+
+def _generation_config(model_dir: str, companion_name: str, source_label: str,
+                       preset_name: str, preset_cfg: Dict[str, str], model_name: str,
+                       temperature, timeout, context_profile, sample_conversations,
+                       max_memories, memory_per_chat_max, max_parallel,
+                       fresh_scan: bool) -> "GenerationConfig":
+    """GenerationConfig from the shared Settings inputs (preserve + re-run)."""
+    from .generate import GenerationConfig
+
+    _, context_window, budget = derive_context_and_budget(preset_name, model_name, context_profile or "auto")
+    return GenerationConfig(
+        input_dir=model_dir,
+        output_dir="outputs",
+        companion_name=companion_name,
+        creator="preservation-toolkit",
+        source_label=source_label,
+        sample_conversations=state_int(sample_conversations, 0) or 50,
+        conversation_sampling=DEFAULT_CONVERSATION_SAMPLING,
+        sampling_seed=DEFAULT_SAMPLING_SEED,
+        max_memories=state_int(max_memories, 0) or 24,
+        memory_per_chat_max=state_int(memory_per_chat_max, 0) or 6,
+        max_messages_per_conversation=budget["max_messages_per_conversation"],
+        max_chars_per_conversation=budget["max_chars_per_conversation"],
+        max_total_chars=budget["max_total_chars"],
+        model_context_window=context_window,
+        max_parallel_calls=state_int(max_parallel, 0) or 4,
+        llm_provider=preset_cfg["provider"],
+        llm_base_url=preset_cfg["base_url"],
+        llm_model=model_name,
+        llm_api_key=preset_cfg["api_key"],
+        llm_site_url=preset_cfg.get("site_url", "http://localhost"),
+        llm_app_name=preset_cfg.get("app_name", "companion-preserver"),
+        temperature=state_float(temperature, 0.2),
+        request_timeout=state_int(timeout, 0) or budget["request_timeout"],
+        fresh_scan=fresh_scan,
+    )
+
+
+async def _stream_generation(config: "GenerationConfig", logs: Deque[str], outcome: Dict[str, Any]):
+    """Run generation off the event loop, yielding the log tail as lines arrive.
+
+    Fills outcome["report"] or outcome["error"] once generation finishes.
+    """
+    from .generate import run_generation
+    loop = asyncio.get_running_loop()
+    log_queue: "asyncio.Queue[Optional[str]]" = asyncio.Queue()
+
+    def _log(m: str) -> None:
+        if m:
+            loop.call_soon_threadsafe(log_queue.put_nowait, m)
+
+    task = asyncio.ensure_future(asyncio.to_thread(run_generation, config, log_fn=_log))
+    # Queued after every log line the worker emitted; wakes the reader at once
+    task.add_done_callback(lambda _: log_queue.put_nowait(None))
+
+    last_emit = 0.0
+    pending = 0
+    finished = False
+    while not finished:
+        # Idle: sleep until a line arrives. Lines held back: wake at the flush deadline.
+        timeout = max(0.0, last_emit + 0.75 - time.monotonic()) if pending else None
+        try:
+            item = await asyncio.wait_for(log_queue.get(), timeout=timeout)
+            while True:
+                if item is None:
+                    finished = True
+                    break
+                logs.append(item)
+                pending += 1
+                item = log_queue.get_nowait()
+        except (asyncio.TimeoutError, asyncio.QueueEmpty):
+            pass
+        # Coalesce: one UI update per few lines or per 0.75s, not per line
+        now = time.monotonic()
+        if pending and (pending >= 4 or (now - last_emit) >= 0.75):
+            # Only the log box changes mid-run; leave the run-dir output untouched
+            yield "\n".join(logs), gr.skip()
+            last_emit = now
+            pending = 0
+
+    try:
+        report = task.result()
+    except Exception as exc:
+        outcome["error"] = str(exc)
+        return
+    if isinstance(report, dict):
+        # The editor auto-loads this run next; hand it the objects just written
+        files = report.get("output_files") or {}
+        if "card_obj" in report:
+            _remember_json(files.get("card", ""), report.pop("card_obj"))
+        if "lorebook_obj" in report:
+            _remember_json(files.get("lorebook", ""), report.pop("lorebook_obj"))
+    outcome["report"] = report
+
+
 # ---------------------------------------------------------------------------
 # One-click preserve handler
 # ---------------------------------------------------------------------------
 
-def _preserve_one_click(upload_file, companion_name: str, preset_name: str, model_name: str,
+async def _preserve_one_click(upload_file, companion_name: str, preset_name: str, model_name: str,
                         temperature: float, timeout: int, context_profile: str,
                         sample_conversations: int, max_memories: int, memory_per_chat_max: int,
                         max_parallel: int):
-    logs: List[str] = []
+    logs: Deque[str] = deque(maxlen=LOG_TAIL_LINES)
 
     if not upload_file:
         yield "Please upload your chat export file.", ""
@@ -373,7 +586,7 @@ def _preserve_one_click(upload_file, companion_name: str, preset_name: str, mode
     preset_name = (preset_name or "").strip()
     model_name = (model_name or DEFAULT_EXTRACTION_MODEL).strip()
 
-    preset_cfg, err = resolve_preset_config(preset_name)
+    preset_cfg, err = await asyncio.to_thread(resolve_preset_config, preset_name)
     if err or not preset_cfg:
         yield f"No valid LLM preset configured. Go to Settings first.\n({err})", ""
         return
@@ -388,7 +601,7 @@ def _preserve_one_click(upload_file, companion_name: str, preset_name: str, mode
     logs.append(f"Processing: {os.path.basename(input_path)}")
     yield "\n".join(logs), ""
 
-    conv_path, log = resolve_conversations_path(input_path)
+    conv_path, log = await asyncio.to_thread(resolve_conversations_path, input_path)
     logs.append(log)
     yield "\n".join(logs), ""
     if not conv_path:
@@ -396,13 +609,13 @@ def _preserve_one_click(upload_file, companion_name: str, preset_name: str, mode
         yield "\n".join(logs), ""
         return
 
-    export_fmt = detect_export_format(conv_path)
+    export_fmt = await asyncio.to_thread(detect_export_format, conv_path)
     logs.append(f"Detected format: {export_fmt}")
     yield "\n".join(logs), ""
 
     logs.append("Discovering conversations...")
     yield "\n".join(logs), ""
-    msg_counts, _ = discover_models(conv_path)
+    msg_counts, _ = await asyncio.to_thread(discover_models, conv_path)
     model_list = sorted(msg_counts.keys())
     if not model_list:
         logs.append("No conversations found in export.")
@@ -414,19 +627,24 @@ def _preserve_one_click(upload_file, companion_name: str, preset_name: str, mode
     yield "\n".join(logs), ""
 
     output_dir = "model_exports"
-    count, _ = extract_by_models(conv_path, model_list, output_dir, max_conversations=0, log_fn=lambda m: None)
+    count, _ = await asyncio.to_thread(
+        extract_by_models, conv_path, model_list, output_dir, max_conversations=0, log_fn=lambda m: None,
+    )
     logs.append(f"Extracted {count} conversations.")
     yield "\n".join(logs), ""
 
     primary_model = model_list[0]
+    from .dataset import build_dataset
     from .extract import sanitize_filename
     model_dir = os.path.join(output_dir, sanitize_filename(primary_model))
-    if not os.path.isdir(model_dir):
+    if not await asyncio.to_thread(os.path.isdir, model_dir):
         model_dir = os.path.join(output_dir, primary_model)
 
     dataset_file = os.path.join("datasets", f"{sanitize_filename(primary_model)}_chat.jsonl")
     try:
-        build_dataset(model_dir, dataset_file, image_mode="strip", max_conversations=0, include_meta=True)
+        await asyncio.to_thread(
+            build_dataset, model_dir, dataset_file, image_mode="strip", max_conversations=0, include_meta=True,
+        )
     except RuntimeError:
         pass
 
@@ -434,101 +652,50 @@ def _preserve_one_click(upload_file, companion_name: str, preset_name: str, mode
     logs.append("This may take a few minutes.")
     yield "\n".join(logs), ""
 
-    _, context_window, budget = derive_context_and_budget(preset_name, model_name, context_profile or "auto")
-
-    config = GenerationConfig(
-        input_dir=model_dir,
-        output_dir="outputs",
-        companion_name=companion_name,
-        creator="preservation-toolkit",
-        source_label=export_fmt,
-        sample_conversations=int(sample_conversations) if sample_conversations else 50,
-        conversation_sampling=DEFAULT_CONVERSATION_SAMPLING,
-        sampling_seed=DEFAULT_SAMPLING_SEED,
-        max_memories=int(max_memories) if max_memories else 24,
-        memory_per_chat_max=int(memory_per_chat_max) if memory_per_chat_max else 6,
-        max_messages_per_conversation=budget["max_messages_per_conversation"],
-        max_chars_per_conversation=budget["max_chars_per_conversation"],
-        max_total_chars=budget["max_total_chars"],
-        model_context_window=context_window,
-        max_parallel_calls=int(max_parallel) if max_parallel else 4,
-        llm_provider=preset_cfg["provider"],
-        llm_base_url=preset_cfg["base_url"],
-        llm_model=model_name,
-        llm_api_key=preset_cfg["api_key"],
-        llm_site_url=preset_cfg.get("site_url", "http://localhost"),
-        llm_app_name=preset_cfg.get("app_name", "companion-preserver"),
-        temperature=float(temperature) if temperature is not None else 0.2,
-        request_timeout=int(timeout) if timeout else budget["request_timeout"],
-        fresh_scan=False,
+    config = await asyncio.to_thread(
+        _generation_config,
+        model_dir, companion_name, export_fmt, preset_name, preset_cfg, model_name,
+        temperature, timeout, context_profile, sample_conversations, max_memories,
+        memory_per_chat_max, max_parallel, fresh_scan=False,
     )
 
-    log_queue: "queue.Queue[str]" = queue.Queue()
-    done_event = threading.Event()
-    result_box: Dict[str, Any] = {}
-    error_box: Dict[str, str] = {}
-
-    def _log(m: str) -> None:
-        if m:
-            log_queue.put(m)
-
-    def _worker() -> None:
-        try:
-            result_box["report"] = run_generation(config, log_fn=_log)
-        except Exception as exc:
-            error_box["msg"] = str(exc)
-        finally:
-            done_event.set()
-
-    threading.Thread(target=_worker, daemon=True).start()
-
-    last_emit = 0.0
-    while not done_event.is_set() or not log_queue.empty():
-        while True:
-            try:
-                logs.append(log_queue.get_nowait())
-            except queue.Empty:
-                break
-        now = time.time()
-        if (now - last_emit) >= 1.0:
-            yield "\n".join(logs[-15:]) if logs else "Running...", ""
-            last_emit = now
-        if not done_event.is_set():
-            time.sleep(0.4)
-
-    if error_box.get("msg"):
-        logs.append(f"\nError: {error_box['msg']}")
-        yield "\n".join(logs[-15:]), ""
+    outcome: Dict[str, Any] = {}
+    async for update in _stream_generation(config, logs, outcome):
+        yield update
+    if outcome.get("error"):
+        logs.append(f"\nError: {outcome['error']}")
+        yield "\n".join(logs), ""
         return
 
-    report = result_box.get("report")
+    report = outcome.get("report")
+
     if not isinstance(report, dict):
         logs.append("Generation failed — no report returned.")
-        yield "\n".join(logs[-15:]), ""
+        yield "\n".join(logs), ""
         return
 
-    merge_ui_state({
+    await asyncio.to_thread(merge_ui_state, {
         "last_card_path": report["output_files"]["card"],
         "last_extract_dir": model_dir,
         "last_transcript_path": report["output_files"].get("transcript", ""),
     })
 
     logs.append(f"\nDone! Head to the 'Review & Edit' tab.")
-    yield "\n".join(logs[-15:]), report.get("run_dir", "")
+    yield "\n".join(logs), report.get("run_dir", "")
 
 
 # ---------------------------------------------------------------------------
 # Re-run handler (uses existing extracted data with current settings)
 # ---------------------------------------------------------------------------
 
-def _rerun_generation(companion_name: str, preset_name: str, model_name: str,
+async def _rerun_generation(companion_name: str, preset_name: str, model_name: str,
                       temperature: float, timeout: int, context_profile: str,
                       sample_conversations: int, max_memories: int, memory_per_chat_max: int,
                       max_parallel: int):
     """Re-run generation using previously extracted conversations."""
-    ui_state = load_ui_state()
+    ui_state = await asyncio.to_thread(load_ui_state)
     model_dir = state_str(ui_state.get("last_extract_dir"), "")
-    if not model_dir or not os.path.isdir(model_dir):
+    if not model_dir or not await asyncio.to_thread(os.path.isdir, model_dir):
         yield "No previous extraction found. Run 'Preserve My Companion' first.", ""
         return
 
@@ -540,132 +707,83 @@ def _rerun_generation(companion_name: str, preset_name: str, model_name: str,
     preset_name = (preset_name or "").strip()
     model_name = (model_name or DEFAULT_EXTRACTION_MODEL).strip()
 
-    preset_cfg, err = resolve_preset_config(preset_name)
+    preset_cfg, err = await asyncio.to_thread(resolve_preset_config, preset_name)
     if err or not preset_cfg:
         yield f"Preset error: {err}", ""
         return
 
-    logs = [f"Re-running generation for {companion_name} with {model_name}...",
-            f"Using data from: {model_dir}"]
+    logs: Deque[str] = deque(
+        [f"Re-running generation for {companion_name} with {model_name}...",
+         f"Using data from: {model_dir}"],
+        maxlen=LOG_TAIL_LINES,
+    )
     yield "\n".join(logs), ""
 
-    _, context_window, budget = derive_context_and_budget(preset_name, model_name, context_profile or "auto")
-
-    config = GenerationConfig(
-        input_dir=model_dir,
-        output_dir="outputs",
-        companion_name=companion_name,
-        creator="preservation-toolkit",
-        source_label="re-run",
-        sample_conversations=int(sample_conversations) if sample_conversations else 50,
-        conversation_sampling=DEFAULT_CONVERSATION_SAMPLING,
-        sampling_seed=DEFAULT_SAMPLING_SEED,
-        max_memories=int(max_memories) if max_memories else 24,
-        memory_per_chat_max=int(memory_per_chat_max) if memory_per_chat_max else 6,
-        max_messages_per_conversation=budget["max_messages_per_conversation"],
-        max_chars_per_conversation=budget["max_chars_per_conversation"],
-        max_total_chars=budget["max_total_chars"],
-        model_context_window=context_window,
-        max_parallel_calls=int(max_parallel) if max_parallel else 4,
-        llm_provider=preset_cfg["provider"],
-        llm_base_url=preset_cfg["base_url"],
-        llm_model=model_name,
-        llm_api_key=preset_cfg["api_key"],
-        llm_site_url=preset_cfg.get("site_url", "http://localhost"),
-        llm_app_name=preset_cfg.get("app_name", "companion-preserver"),
-        temperature=float(temperature) if temperature is not None else 0.2,
-        request_timeout=int(timeout) if timeout else budget["request_timeout"],
-        fresh_scan=True,
+    config = await asyncio.to_thread(
+        _generation_config,
+        model_dir, companion_name, "re-run", preset_name, preset_cfg, model_name,
+        temperature, timeout, context_profile, sample_conversations, max_memories,
+        memory_per_chat_max, max_parallel, fresh_scan=True,
     )
 
-    log_queue: "queue.Queue[str]" = queue.Queue()
-    done_event = threading.Event()
-    result_box: Dict[str, Any] = {}
-    error_box: Dict[str, str] = {}
-
-    def _log(m: str) -> None:
-        if m:
-            log_queue.put(m)
-
-    def _worker() -> None:
-        try:
-            result_box["report"] = run_generation(config, log_fn=_log)
-        except Exception as exc:
-            error_box["msg"] = str(exc)
-        finally:
-            done_event.set()
-
-    threading.Thread(target=_worker, daemon=True).start()
-
-    last_emit = 0.0
-    while not done_event.is_set() or not log_queue.empty():
-        while True:
-            try:
-                logs.append(log_queue.get_nowait())
-            except queue.Empty:
-                break
-        now = time.time()
-        if (now - last_emit) >= 1.0:
-            yield "\n".join(logs[-15:]) if logs else "Running...", ""
-            last_emit = now
-        if not done_event.is_set():
-            time.sleep(0.4)
-
-    if error_box.get("msg"):
-        logs.append(f"\nError: {error_box['msg']}")
-        yield "\n".join(logs[-15:]), ""
+    outcome: Dict[str, Any] = {}
+    async for update in _stream_generation(config, logs, outcome):
+        yield update
+    if outcome.get("error"):
+        logs.append(f"\nError: {outcome['error']}")
+        yield "\n".join(logs), ""
         return
 
-    report = result_box.get("report")
+    report = outcome.get("report")
+
     if not isinstance(report, dict):
         logs.append("Generation failed.")
-        yield "\n".join(logs[-15:]), ""
+        yield "\n".join(logs), ""
         return
 
-    merge_ui_state({
+    await asyncio.to_thread(merge_ui_state, {
         "last_card_path": report["output_files"]["card"],
         "last_transcript_path": report["output_files"].get("transcript", ""),
     })
 
     logs.append(f"\nDone! Head to 'Review & Edit' or refresh the run list.")
-    yield "\n".join(logs[-15:]), report.get("run_dir", "")
+    yield "\n".join(logs), report.get("run_dir", "")
 
 
 # ---------------------------------------------------------------------------
 # Fidelity handler
 # ---------------------------------------------------------------------------
 
-def _run_fidelity_simple(preset_name, tier_key, custom_models_text,
+async def _run_fidelity_simple(preset_name, tier_key, custom_models_text,
                          card_path, transcript_path, judge_model, temperature, timeout):
-    if not card_path or not os.path.isfile(card_path):
-        return "No companion card found. Run 'Preserve' first.", ""
-    if not transcript_path or not os.path.isfile(transcript_path):
-        return "No transcript found. Run 'Preserve' first.", ""
+    if not card_path or not await asyncio.to_thread(os.path.isfile, card_path):
+        yield "No companion card found. Run 'Preserve' first.", ""
+        return
+    if not transcript_path or not await asyncio.to_thread(os.path.isfile, transcript_path):
+        yield "No transcript found. Run 'Preserve' first.", ""
+        return
 
     if tier_key == "custom":
-        models = [m.strip() for m in (custom_models_text or "").split("\n") if m.strip()][:5]
+        models = [m.strip() for m in _MODELS_SPLIT_RE.split(custom_models_text or "") if m.strip()][:5]
     else:
         models = MODEL_TIERS.get(tier_key, {}).get("models", [])[:5]
     if not models:
-        return "No models selected.", ""
+        yield "No models selected.", ""
+        return
 
-    preset, err = resolve_preset_config(preset_name)
+    preset, err = await asyncio.to_thread(resolve_preset_config, preset_name)
     if err or not preset:
-        return f"Preset error: {err}.", ""
+        yield f"Preset error: {err}.", ""
+        return
 
+    from .fidelity import FidelityConfig, format_fidelity_markdown, run_fidelity_evaluation
     config = FidelityConfig(
         card_path=card_path, transcript_path=transcript_path, output_dir="outputs",
         provider=preset["provider"], base_url=preset["base_url"],
         api_key=preset["api_key"], site_url=preset.get("site_url", ""),
         app_name=preset.get("app_name", ""),
         model_names=models,
-        test_prompts=[
-            "I had a long day and want to reset.",
-            "Can you summarize what we focused on recently?",
-            "Help me plan tomorrow in a realistic way.",
-            "What patterns do you notice in how I solve problems?",
-            "Let's pick one concrete next step.",
-        ],
+        test_prompts=list(FIDELITY_TEST_PROMPTS),
         temperature=float(temperature), timeout=int(timeout),
         judge_provider=preset["provider"], judge_base_url=preset["base_url"],
         judge_api_key=preset["api_key"], judge_site_url=preset.get("site_url", ""),
@@ -673,15 +791,37 @@ def _run_fidelity_simple(preset_name, tier_key, custom_models_text,
         judge_model=(judge_model or "").strip(),
     )
 
+    # Rank models as they finish instead of waiting for the whole benchmark
+    loop = asyncio.get_running_loop()
+    result_queue: "asyncio.Queue[Optional[Dict[str, Any]]]" = asyncio.Queue()
+
+    def _on_result(result: Dict[str, Any]) -> None:
+        loop.call_soon_threadsafe(result_queue.put_nowait, result)
+
+    task = asyncio.ensure_future(asyncio.to_thread(run_fidelity_evaluation, config, result_fn=_on_result))
+    task.add_done_callback(lambda _: result_queue.put_nowait(None))
+
+    yield f"Testing {len(models)} model(s)...", ""
+    finished: List[Dict[str, Any]] = []
+    md = ""
+    while (result := await result_queue.get()) is not None:
+        finished.append(result)
+        finished.sort(key=lambda r: (not r.get("error"), (r.get("scores") or {}).get("final_score", 0)), reverse=True)
+        md = format_fidelity_markdown({
+            "results": finished, "test_prompts": config.test_prompts, "judge_model": config.judge_model,
+        })
+        yield f"Scored {len(finished)}/{len(models)} model(s)...", md
+
     try:
-        report = run_fidelity_evaluation(config)
+        report = task.result()
     except Exception as exc:
-        return f"Error: {exc}", ""
+        yield f"Error: {exc}", md
+        return
 
     md = format_fidelity_markdown(report)
     best = (report.get("results") or [{}])[0]
     status = f"Done. Best: {best.get('model', 'n/a')} (score: {(best.get('scores') or {}).get('final_score', 'n/a')})"
-    return status, md
+    yield status, md
 
 
 # ---------------------------------------------------------------------------
@@ -691,7 +831,7 @@ def _run_fidelity_simple(preset_name, tier_key, custom_models_text,
 def _make_card_download(card_state, lore_state, image_file):
     if not card_state:
         return None
-    card = json.loads(json.dumps(card_state))
+    card = loads(dumps_compact(card_state))
     if lore_state and isinstance(lore_state, dict):
         book = lore_state.get("data")
         if isinstance(book, dict) and "data" in card and isinstance(card["data"], dict):
@@ -712,8 +852,8 @@ def _make_card_download(card_state, lore_state, image_file):
             pass
     out_path = os.path.join("outputs", "companion_card.json")
     os.makedirs("outputs", exist_ok=True)
-    with open(out_path, "w", encoding="utf-8") as f:
-        json.dump(card, f, ensure_ascii=False, indent=2)
+    with open(out_path, "wb") as f:
+        f.write(dumps_pretty(card))
     return out_path
 
 
@@ -722,8 +862,8 @@ def _make_lorebook_download(lore_state):
         return None
     out_path = os.path.join("outputs", "lorebook_v3.json")
     os.makedirs("outputs", exist_ok=True)
-    with open(out_path, "w", encoding="utf-8") as f:
-        json.dump(lore_state, f, ensure_ascii=False, indent=2)
+    with open(out_path, "wb") as f:
+        f.write(dumps_pretty(lore_state))
     return out_path
 
 
@@ -747,8 +887,8 @@ def _make_ccv2_download(card_state, lore_state, image_file):
             pass
     out_path = os.path.join("outputs", "companion_card_v2.json")
     os.makedirs("outputs", exist_ok=True)
-    with open(out_path, "w", encoding="utf-8") as f:
-        json.dump(ccv2, f, ensure_ascii=False, indent=2)
+    with open(out_path, "wb") as f:
+        f.write(dumps_pretty(ccv2))
     return out_path
 
 
@@ -798,7 +938,6 @@ def build_ui() -> "gr.Blocks":
         lore_state = gr.State(value={})
         lore_entries_state = gr.State(value=[])
         lore_page_state = gr.State(value=0)
-        run_dir_state = gr.State(value="")
 
         # ================================================================
         # Tab 1: Preserve My Companion
@@ -916,11 +1055,16 @@ def build_ui() -> "gr.Blocks":
             lore_render_outputs.append(lore_page_label)
             lore_render_outputs.append(lore_page_state)
 
+            # Already on the first/last page: nothing changes, so send nothing
             def _lore_prev(entries, page):
-                return _render_lore(entries, max(0, page - 1))
+                if page <= 0:
+                    return [gr.skip()] * len(lore_render_outputs)
+                return _render_lore(entries, page - 1)
             def _lore_next(entries, page):
                 tp = max(1, math.ceil(len(entries) / LORE_PAGE_SIZE))
-                return _render_lore(entries, min(tp - 1, page + 1))
+                if page >= tp - 1:
+                    return [gr.skip()] * len(lore_render_outputs)
+                return _render_lore(entries, page + 1)
             def _lore_add(entries, page):
                 entries = list(entries) + [{
                     "keys": ["new"], "content": "", "extensions": {}, "enabled": True,
@@ -933,9 +1077,14 @@ def build_ui() -> "gr.Blocks":
                 np = max(0, math.ceil(len(entries) / LORE_PAGE_SIZE) - 1)
                 return [entries] + _render_lore(entries, np)
 
-            lore_prev_btn.click(_lore_prev, [lore_entries_state, lore_page_state], lore_render_outputs)
-            lore_next_btn.click(_lore_next, [lore_entries_state, lore_page_state], lore_render_outputs)
-            lore_add_btn.click(_lore_add, [lore_entries_state, lore_page_state], [lore_entries_state] + lore_render_outputs)
+            # Paging and adding change which entries the slots map to, so they share
+            # _sync_lore's queue slot and never overtake a pending slot sync
+            lore_prev_btn.click(_lore_prev, [lore_entries_state, lore_page_state], lore_render_outputs,
+                                concurrency_limit=1, concurrency_id="lore_entries")
+            lore_next_btn.click(_lore_next, [lore_entries_state, lore_page_state], lore_render_outputs,
+                                concurrency_limit=1, concurrency_id="lore_entries")
+            lore_add_btn.click(_lore_add, [lore_entries_state, lore_page_state], [lore_entries_state] + lore_render_outputs,
+                               concurrency_limit=1, concurrency_id="lore_entries")
 
             # Sync form edits back to entries
             def _sync_lore(entries, page, *vals):
@@ -954,9 +1103,15 @@ def build_ui() -> "gr.Blocks":
             for i in range(MAX_LORE_SLOTS):
                 lore_sync_inputs.extend([lore_name_slots[i], lore_keys_slots[i], lore_content_slots[i]])
 
-            for i in range(MAX_LORE_SLOTS):
-                for f in [lore_name_slots[i], lore_keys_slots[i], lore_content_slots[i]]:
-                    f.change(_sync_lore, lore_sync_inputs, [lore_entries_state])
+            # One multi-trigger listener rather than one per slot field. Kept on the
+            # queue and serialized so the newest keystroke's state always lands last.
+            gr.on(
+                [f.change for i in range(MAX_LORE_SLOTS)
+                 for f in (lore_name_slots[i], lore_keys_slots[i], lore_content_slots[i])],
+                _sync_lore, lore_sync_inputs, [lore_entries_state],
+                concurrency_limit=1, concurrency_id="lore_entries",
+                trigger_mode="always_last", show_progress="hidden",
+            )
 
             # NOTE: no lore_entries_state.change auto-triggers — avoids infinite
             # event loops. Lorebook JSON is rebuilt from entries at export time.
@@ -1001,10 +1156,8 @@ def build_ui() -> "gr.Blocks":
                 edit_first_mes, edit_alt_greetings, edit_mes_example,
                 edit_post_history, edit_creator_notes, edit_tags,
             ]
-            for f in [edit_name, edit_nickname, edit_description, edit_system_prompt,
-                       edit_first_mes, edit_alt_greetings, edit_mes_example,
-                       edit_post_history, edit_creator_notes, edit_tags]:
-                f.change(form_to_card, form_inputs, [card_state])
+            gr.on([f.change for f in form_inputs[1:]], form_to_card, form_inputs, [card_state],
+                  concurrency_limit=1, trigger_mode="always_last", show_progress="hidden")
 
             # Export — rebuild lorebook from entries at export time
             def _exp_card(cs, ents, ls, img):
@@ -1020,9 +1173,13 @@ def build_ui() -> "gr.Blocks":
                 p = _make_ccv2_download(cs, fresh_ls, img)
                 return (gr.update(value=p), f"Saved CCv2 ({os.path.splitext(p)[1]})" if p else "No data.") if p else (gr.update(value=None), "No data.")
 
-            export_card_btn.click(_exp_card, [card_state, lore_entries_state, lore_state, edit_image], [export_card_file, export_status])
-            export_lore_btn.click(_exp_lore, [lore_entries_state, lore_state], [export_lore_file, export_status])
-            export_ccv2_btn.click(_exp_ccv2, [card_state, lore_entries_state, lore_state, edit_image], [export_ccv2_file, export_status])
+            # Exports overwrite fixed files under outputs/, so they run one at a time
+            export_card_btn.click(_exp_card, [card_state, lore_entries_state, lore_state, edit_image], [export_card_file, export_status],
+                                  concurrency_limit=1, concurrency_id="exports")
+            export_lore_btn.click(_exp_lore, [lore_entries_state, lore_state], [export_lore_file, export_status],
+                                  concurrency_limit=1, concurrency_id="exports")
+            export_ccv2_btn.click(_exp_ccv2, [card_state, lore_entries_state, lore_state, edit_image], [export_ccv2_file, export_status],
+                                  concurrency_limit=1, concurrency_id="exports")
 
 
         # ================================================================
@@ -1030,9 +1187,7 @@ def build_ui() -> "gr.Blocks":
         # ================================================================
         with gr.Tab("Fidelity Lab"):
             gr.Markdown("### Find which model brings them back best")
-            tier_choices_fid = [(t["label"], k) for k, t in MODEL_TIERS.items()]
-            tier_choices_fid.append(("Custom (pick your own)", "custom"))
-            fid_tier = gr.Dropdown(label="Model Tier", choices=tier_choices_fid, value="tier1_cn_open")
+            fid_tier = gr.Dropdown(label="Model Tier", choices=FIDELITY_TIER_CHOICES, value="tier1_cn_open")
             fid_tier_info = gr.Markdown("**Models:** " + ", ".join(MODEL_TIERS["tier1_cn_open"]["models"]))
             fid_custom = gr.Textbox(label="Custom Models (one per line, max 5)", lines=5, visible=False,
                                     placeholder="openai/gpt-5.2-chat\n...")
@@ -1043,9 +1198,9 @@ def build_ui() -> "gr.Blocks":
                 m = MODEL_TIERS.get(k, {}).get("models", [])
                 return "**Models:** " + ", ".join(m), gr.update(visible=False)
 
-            fid_tier.change(_tier_info, [fid_tier], [fid_tier_info, fid_custom])
+            fid_tier.change(_tier_info, [fid_tier], [fid_tier_info, fid_custom], queue=False)
             fid_judge = gr.Dropdown(label="Judge Model",
-                                    choices=[DEFAULT_JUDGE_MODEL] + [m for t in MODEL_TIERS.values() for m in t["models"]],
+                                    choices=JUDGE_MODEL_CHOICES,
                                     value=DEFAULT_JUDGE_MODEL, allow_custom_value=True)
             fid_btn = gr.Button("Run Fidelity Benchmark", variant="primary")
             fid_status = gr.Textbox(label="Status", lines=2, interactive=False)
@@ -1090,25 +1245,28 @@ def build_ui() -> "gr.Blocks":
             with gr.Accordion("Extraction Prompts", open=False):
                 gr.Markdown("Edit prompts sent to the LLM. Changes take effect on next run.")
                 with gr.Accordion("Persona Observation", open=False):
-                    prompt_obs_sys = gr.Textbox(label="System", value=PERSONA_OBSERVATION_SYSTEM_PROMPT.strip(), lines=8, interactive=True, elem_classes=["scroll-prompt"])
-                    prompt_obs_usr = gr.Textbox(label="User Template", value=PERSONA_OBSERVATION_USER_PROMPT.strip(), lines=12, interactive=True, elem_classes=["scroll-prompt"])
+                    prompt_obs_sys = gr.Textbox(label="System", value=_PROMPT_DEFAULTS["persona_observation_system"], lines=8, interactive=True, elem_classes=["scroll-prompt"])
+                    prompt_obs_usr = gr.Textbox(label="User Template", value=_PROMPT_DEFAULTS["persona_observation_user"], lines=12, interactive=True, elem_classes=["scroll-prompt"])
                 with gr.Accordion("Persona Synthesis", open=False):
-                    prompt_syn_sys = gr.Textbox(label="System", value=PERSONA_SYNTHESIS_SYSTEM_PROMPT.strip(), lines=8, interactive=True, elem_classes=["scroll-prompt"])
-                    prompt_syn_usr = gr.Textbox(label="User Template", value=PERSONA_SYNTHESIS_USER_PROMPT.strip(), lines=12, interactive=True, elem_classes=["scroll-prompt"])
+                    prompt_syn_sys = gr.Textbox(label="System", value=_PROMPT_DEFAULTS["persona_synthesis_system"], lines=8, interactive=True, elem_classes=["scroll-prompt"])
+                    prompt_syn_usr = gr.Textbox(label="User Template", value=_PROMPT_DEFAULTS["persona_synthesis_user"], lines=12, interactive=True, elem_classes=["scroll-prompt"])
                 with gr.Accordion("Memory Extraction", open=False):
-                    prompt_mem_sys = gr.Textbox(label="System", value=MEMORY_SYSTEM_PROMPT.strip(), lines=8, interactive=True, elem_classes=["scroll-prompt"])
-                    prompt_mem_usr = gr.Textbox(label="User Template", value=MEMORY_USER_PROMPT.strip(), lines=12, interactive=True, elem_classes=["scroll-prompt"])
+                    prompt_mem_sys = gr.Textbox(label="System", value=_PROMPT_DEFAULTS["memory_system"], lines=8, interactive=True, elem_classes=["scroll-prompt"])
+                    prompt_mem_usr = gr.Textbox(label="User Template", value=_PROMPT_DEFAULTS["memory_user"], lines=12, interactive=True, elem_classes=["scroll-prompt"])
                 with gr.Accordion("Memory Synthesis", open=False):
-                    prompt_msyn_sys = gr.Textbox(label="System", value=MEMORY_SYNTHESIS_SYSTEM_PROMPT.strip(), lines=8, interactive=True, elem_classes=["scroll-prompt"])
-                    prompt_msyn_usr = gr.Textbox(label="User Template", value=MEMORY_SYNTHESIS_USER_PROMPT.strip(), lines=12, interactive=True, elem_classes=["scroll-prompt"])
-
-            # Settings callbacks
-            settings_provider.change(lambda p: default_base_url(p), [settings_provider], [settings_base])
-            settings_selector.change(_settings_load_preset, [settings_selector], [settings_provider, settings_base, settings_key, settings_name])
-            settings_load_btn.click(_settings_load_preset, [settings_selector], [settings_provider, settings_base, settings_key, settings_name])
+                    prompt_msyn_sys = gr.Textbox(label="System", value=_PROMPT_DEFAULTS["memory_synthesis_system"], lines=8, interactive=True, elem_classes=["scroll-prompt"])
+                    prompt_msyn_usr = gr.Textbox(label="User Template", value=_PROMPT_DEFAULTS["memory_synthesis_user"], lines=12, interactive=True, elem_classes=["scroll-prompt"])
+
+            # Settings callbacks — local lookups skip the queue. Save and delete rewrite
+            # presets.json and the model cache, so they share one queue slot.
+            settings_provider.change(lambda p: default_base_url(p), [settings_provider], [settings_base], queue=False)
+            settings_selector.change(_settings_load_preset, [settings_selector], [settings_provider, settings_base, settings_key, settings_name], queue=False)
+            settings_load_btn.click(_settings_load_preset, [settings_selector], [settings_provider, settings_base, settings_key, settings_name], queue=False)
             save_status = gr.Textbox(visible=False)
-            settings_save_btn.click(_settings_save_preset, [settings_name, settings_provider, settings_base, settings_key], [save_status, settings_selector, settings_name])
-            settings_delete_btn.click(_settings_delete_preset, [settings_selector], [save_status, settings_selector, settings_name])
+            settings_save_btn.click(_settings_save_preset, [settings_name, settings_provider, settings_base, settings_key], [save_status, settings_selector, settings_name],
+                                    concurrency_limit=1, concurrency_id="presets")
+            settings_delete_btn.click(_settings_delete_preset, [settings_selector], [save_status, settings_selector, settings_name],
+                                      concurrency_limit=1, concurrency_id="presets")
 
         # ================================================================
         # Cross-tab wiring
@@ -1117,22 +1275,26 @@ def build_ui() -> "gr.Blocks":
         adv_inputs = [settings_temp, settings_timeout, settings_context,
                       settings_samples, settings_max_mem, settings_mem_chat, settings_parallel]
 
+        # Preserve and re-run share one worker slot: both write a run into outputs/
         preserve_btn.click(
             _preserve_one_click,
             [preserve_upload, preserve_name, settings_selector, settings_model] + adv_inputs,
             [preserve_log, preserve_run_dir],
+            concurrency_limit=1, concurrency_id="generation",
         )
 
         rerun_btn.click(
             _rerun_generation,
             [preserve_name, settings_selector, settings_model] + adv_inputs,
             [preserve_log, preserve_run_dir],
+            concurrency_limit=1, concurrency_id="generation",
         )
 
-        # Auto-load into editor when preserve/rerun completes
-        preserve_run_dir.change(_load_run, [preserve_run_dir], load_outputs)
-        preserve_run_dir.change(_refresh_runs, [], [run_selector])
-        preserve_run_dir.change(lambda v: v, [preserve_run_dir], [run_dir_state])
+        # Auto-load into editor when preserve/rerun completes — one event, not one per output
+        def _load_new_run(run_path):
+            return (*_load_run(run_path), _refresh_runs())
+
+        preserve_run_dir.change(_load_new_run, [preserve_run_dir], load_outputs + [run_selector])
 
         # Fidelity
         fid_btn.click(
@@ -1140,6 +1302,11 @@ def build_ui() -> "gr.Blocks":
             [settings_selector, fid_tier, fid_custom, fid_judge,
              shared_card_path, shared_transcript_path, settings_temp, settings_timeout],
             [fid_status, fid_report],
+            concurrency_limit=1, concurrency_id="fidelity",
         )
 
+    # Fixed worker pool for queued events, and a bounded backlog so clicks
+    # during a long run are refused instead of piling up behind it. Handlers
+    # that write shared files pin their own concurrency_limit=1 above.
+    demo.queue(default_concurrency_limit=4, max_size=16)
     return demo